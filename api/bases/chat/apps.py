@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class ChatConfig(AppConfig):
     name = 'api.bases.chat'
+
+    def ready(self):
+        from api.bases.chat import signals  # noqa
+        from api.bases.chat.persistence import MessagePersister
+
+        # 워커 종료 시 아직 저장되지 않은 메시지를 flush 합니다.
+        MessagePersister.flush_on_exit()
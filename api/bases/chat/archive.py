@@ -0,0 +1,173 @@
+import mmap
+import os
+import struct
+import uuid
+import zlib
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+
+import msgpack
+from django.conf import settings
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value):
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micros(value):
+    return EPOCH + value * MICROSECOND
+
+
+class MessageArchive:
+    """
+    보관 기간이 지난 메시지를 채팅방 / 날짜(UTC)별 세그먼트 파일에 보관합니다.
+
+      {root}/{room_id}/{YYYY-MM-DD}.seg : 메시지 block_size 건씩 msgpack 으로 묶어 zlib 압축한 블록을 이어 붙인 파일
+      {root}/{room_id}/{YYYY-MM-DD}.idx : 블록별 (가장 오래된 키, 가장 최근 키, offset, 길이, 건수) 고정 길이 항목
+
+    두 파일 모두 덧붙이기만 하므로, 기록 중 중단되어도 기존 블록은 그대로 읽을 수 있습니다.
+    조회 시에는 인덱스로 필요한 블록만 골라 mmap 으로 읽고 압축을 풉니다.
+    키는 history cursor 와 같은 (created_at, id) 입니다.
+    """
+    # min_created_at, min_id, max_created_at, max_id, offset, length, count
+    index_entry = struct.Struct('<qqqqQII')
+
+    def __init__(self, root=None, block_size=None):
+        self.root = root or settings.CHAT_ARCHIVE_ROOT
+        self.block_size = block_size or settings.CHAT_ARCHIVE_BLOCK_SIZE
+
+    def get_room_dir(self, room_id):
+        return os.path.join(self.root, str(room_id))
+
+    def get_paths(self, room_id, day):
+        base = os.path.join(self.get_room_dir(room_id), day)
+        return f'{base}.seg', f'{base}.idx'
+
+    @staticmethod
+    def get_day(created_at):
+        return created_at.astimezone(timezone.utc).strftime('%Y-%m-%d')
+
+    def append(self, room_id, messages):
+        """
+        메시지(get_previous_messages 와 같은 형식의 dict) 목록을 날짜별 세그먼트에 덧붙입니다.
+        """
+        os.makedirs(self.get_room_dir(room_id), exist_ok=True)
+        days = {}
+        for message in messages:
+            days.setdefault(self.get_day(message['created_at']), []).append(message)
+
+        for day, day_messages in days.items():
+            day_messages.sort(key=lambda message: (message['created_at'], message['id']))
+            blocks = [day_messages[index:index + self.block_size]
+                      for index in range(0, len(day_messages), self.block_size)]
+            self._append_blocks(room_id, day, blocks)
+        return len(messages)
+
+    def _append_blocks(self, room_id, day, blocks):
+        segment_path, index_path = self.get_paths(room_id, day)
+        entries = []
+        with open(segment_path, 'ab') as segment:
+            offset = segment.tell()
+            for block in blocks:
+                records = [
+                    [message['id'], str(message['uid']), str(message['user_id']), message['user__username'],
+                     message['content'], to_micros(message['created_at'])]
+                    for message in block
+                ]
+                data = zlib.compress(msgpack.packb(records))
+                segment.write(data)
+                first, last = records[0], records[-1]
+                entries.append(self.index_entry.pack(
+                    first[5], first[0], last[5], last[0], offset, len(data), len(records)
+                ))
+                offset += len(data)
+            segment.flush()
+            os.fsync(segment.fileno())
+
+        # 세그먼트를 디스크에 기록한 뒤에 인덱스를 추가합니다.
+        with open(index_path, 'ab') as index:
+            index.write(b''.join(entries))
+            index.flush()
+            os.fsync(index.fileno())
+
+    def read_index(self, index_path):
+        with open(index_path, 'rb') as index:
+            data = index.read()
+        # 기록 중 중단된 마지막 항목은 무시합니다.
+        usable = len(data) - len(data) % self.index_entry.size
+        return [
+            ((min_time, min_id), (max_time, max_id), offset, length)
+            for min_time, min_id, max_time, max_id, offset, length, _ in self.index_entry.iter_unpack(data[:usable])
+        ]
+
+    @staticmethod
+    def read_blocks(segment_path, blocks):
+        with open(segment_path, 'rb') as segment:
+            if os.fstat(segment.fileno()).st_size == 0:
+                return
+            with mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset, length in blocks:
+                    yield msgpack.unpackb(zlib.decompress(mapped[offset:offset + length]))
+
+    def get_days(self, room_id, before=None):
+        try:
+            names = os.listdir(self.get_room_dir(room_id))
+        except FileNotFoundError:
+            return []
+        days = sorted({name[:-4] for name in names if name.endswith('.idx')}, reverse=True)
+        if before is not None:
+            days = [day for day in days if day <= self.get_day(before)]
+        return days
+
+    def get_previous_messages(self, room_id, before=None, limit=50):
+        """
+        (created_at, id) 키셋 기준으로 before 이전 메시지를 최신순으로 limit 건 조회합니다.
+
+        before 는 Message.get_previous_messages 와 같은 (created_at, id) 튜플이며, id 는 None 일 수 있습니다.
+        """
+        before_key = None
+        if before:
+            created_at, message_id = before
+            before_key = (to_micros(created_at), message_id if message_id is not None else -1)
+
+        found = {}
+        for day in self.get_days(room_id, before and before[0]):
+            segment_path, index_path = self.get_paths(room_id, day)
+            blocks = sorted(
+                (entry for entry in self.read_index(index_path) if before_key is None or entry[0] < before_key),
+                key=lambda entry: entry[1], reverse=True
+            )
+            block_records = self.read_blocks(segment_path, [(offset, length) for _, _, offset, length in blocks])
+            with closing(block_records):
+                for position, records in enumerate(block_records):
+                    for record in records:
+                        key = (record[5], record[0])
+                        if before_key is None or key < before_key:
+                            found[record[0]] = record
+
+                    # 이미 limit 건을 모았고 남은 블록이 모두 그보다 오래되었으면 더 읽지 않습니다.
+                    if len(found) >= limit:
+                        keys = sorted(((record[5], record[0]) for record in found.values()), reverse=True)
+                        kth_key = keys[limit - 1]
+                        if position + 1 == len(blocks) or blocks[position + 1][1] < kth_key:
+                            break
+            if len(found) >= limit:
+                break
+
+        records = sorted(found.values(), key=lambda record: (record[5], record[0]), reverse=True)[:limit]
+        return [self.to_message(record) for record in records]
+
+    @staticmethod
+    def to_message(record):
+        message_id, uid, user_id, username, content, created_at = record
+        return {
+            'id': message_id,
+            'uid': uuid.UUID(uid),
+            'content': content,
+            'user_id': uuid.UUID(user_id),
+            'user__username': username,
+            'created_at': from_micros(created_at),
+        }
@@ -0,0 +1,57 @@
+import arrow
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.bases.chat.archive import MessageArchive
+from api.bases.chat.models import ChatRoom, Message, room_record_cache
+from api.bases.chat.search import get_search_backend, is_search_supported
+
+
+class Command(BaseCommand):
+    help = '보관 기간이 지난 메시지를 채팅방 / 날짜별 세그먼트 파일로 옮기고 DB 에서 나눠 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CHAT_ARCHIVE_RETENTION_DAYS,
+                            help='이 일수보다 오래된 메시지를 옮김')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 옮기고 삭제할 메시지 수')
+        parser.add_argument('--room', type=int, help='특정 채팅방만 처리')
+
+    def handle(self, *args, **options):
+        horizon = arrow.utcnow().shift(days=-options['days']).datetime
+        archive = MessageArchive()
+        room_ids = [options['room']] if options['room'] else ChatRoom.objects.values_list('id', flat=True)
+
+        total = 0
+        for room_id in room_ids:
+            archived = self.archive_room(archive, room_id, horizon, options['batch_size'])
+            if archived:
+                self.stdout.write(f'room {room_id}: archived {archived} messages')
+            total += archived
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} messages older than {horizon.isoformat()}'))
+
+    @staticmethod
+    def archive_room(archive, room_id, horizon, batch_size):
+        query = Message.objects.filter(chat_room=room_id, created_at__lt=horizon).order_by('created_at', 'id').values(
+            'id', 'uid', 'content', 'user_id', 'user__username', 'created_at'
+        )
+        archived = 0
+        while True:
+            messages = list(query[:batch_size])
+            if not messages:
+                return archived
+
+            # 세그먼트에 먼저 기록한 뒤 삭제합니다. 삭제 전에 중단되면 다음 실행에서 다시 기록되며,
+            # 조회 시 같은 id 는 한 번만 반환됩니다.
+            archive.append(room_id, messages)
+            message_ids = [message['id'] for message in messages]
+            with transaction.atomic():
+                if is_search_supported():
+                    get_search_backend().delete_messages(message_ids)
+                Message.objects.filter(id__in=message_ids).delete()
+                # 오래된 순서로 옮기므로 마지막 메시지 시각이 archive 의 최신 시각입니다.
+                ChatRoom.objects.filter(id=room_id).update(archived_until=messages[-1]['created_at'])
+            # 다른 워커의 로컬 캐시는 LOCAL_RECORD_CACHE_TTL 이 지나면 갱신됩니다.
+            room_record_cache.delete(str(room_id))
+            archived += len(messages)
@@ -0,0 +1,177 @@
+import itertools
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant, Message
+from api.bases.user.models import User
+from common.benchmark import QueryCounter, git_revision, summarize
+from common.presence import RoomPresence
+
+BENCH_PREFIX = 'bench'
+
+# (이름, URL, 요청당 쿼리 예산) - 데이터 크기와 관계없이 쿼리 수가 일정해야 합니다.
+ENDPOINTS = [
+    ('chat_rooms', '/v1/chat/', 1),
+    ('chat_room_participants', '/v1/chat/{room_id}/users', 1),
+    ('chat_room_messages', '/v1/chat/{room_id}/messages', 1),
+    ('users', '/v1/user/', 1),
+    ('active_users', '/v1/user/active', 1),
+]
+
+
+class ApiBenchmark:
+    """
+    users 명, rooms 개의 채팅방(방마다 participants 명 / messages 건)을 시딩한 뒤
+    각 엔드포인트를 repeat 번 호출해 응답 시간과 요청당 SQL 쿼리 수를 측정합니다.
+    """
+
+    def __init__(self, users, rooms, participants, messages, repeat=20):
+        self.users = users
+        self.rooms = rooms
+        self.participants = min(participants, users)
+        self.messages = messages
+        self.repeat = repeat
+        self.client = Client()
+        self.presence = RoomPresence()
+
+    def run(self, endpoints=ENDPOINTS):
+        rooms, users = self.seed()
+        try:
+            return {
+                'users': self.users,
+                'rooms': self.rooms,
+                'participants': self.participants,
+                'messages': self.messages,
+                'endpoints': [self.measure(name, url.format(room_id=rooms[0].id), budget)
+                              for name, url, budget in endpoints],
+            }
+        finally:
+            self.cleanup(rooms, users)
+
+    def measure(self, name, url, budget):
+        latencies = []
+        query_counts = []
+        status_code = None
+        for _ in range(self.repeat):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = self.client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+            status_code = response.status_code
+            query_counts.append(counter.count)
+
+        return {
+            'name': name,
+            'url': url,
+            'status': status_code,
+            'latency_ms': summarize(latencies),
+            'queries': max(query_counts),
+            'query_budget': budget,
+        }
+
+    def seed(self):
+        prefix = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create([
+            User(username=f'{BENCH_PREFIX}-{prefix}-{index}') for index in range(self.users)
+        ])
+        rooms = ChatRoom.objects.bulk_create([
+            ChatRoom(title=f'{BENCH_PREFIX}-{prefix}-{index}') for index in range(self.rooms)
+        ])
+        if not connection.features.can_return_rows_from_bulk_insert:
+            rooms = list(ChatRoom.objects.filter(title__startswith=f'{BENCH_PREFIX}-{prefix}-'))
+
+        participants = []
+        messages = []
+        for room_index, room in enumerate(rooms):
+            members = [users[(room_index + offset) % len(users)] for offset in range(self.participants)]
+            participants.extend(ChatRoomParticipant(user=user, chat_room=room) for user in members)
+            messages.extend(
+                Message(user=members[index % len(members)], chat_room=room, content=f'{BENCH_PREFIX} {index}')
+                for index in range(self.messages if members else 0)
+            )
+            for user in members:
+                self.presence.join(room.id, user.id)
+        ChatRoomParticipant.objects.bulk_create(participants, batch_size=1000)
+        Message.objects.bulk_create(messages, batch_size=1000)
+        return rooms, users
+
+    def cleanup(self, rooms, users):
+        for room in rooms:
+            self.presence.client.delete(*self.presence.get_keys(room.id))
+        self.presence.client.hdel(self.presence.members_key, *[str(room.id) for room in rooms])
+        ChatRoom.objects.filter(id__in=[room.id for room in rooms]).delete()
+        User.objects.filter(id__in=[user.id for user in users]).delete()
+        # 다음 데이터 크기 측정에 이전 응답 캐시가 섞이지 않도록 합니다.
+        cache.delete_pattern('user:active:*')
+
+
+def find_violations(result, max_p99_ms=None):
+    violations = []
+    for endpoint in result['endpoints']:
+        label = f"{endpoint['name']} (users={result['users']})"
+        if endpoint['status'] != 200:
+            violations.append(f"{label}: status {endpoint['status']}")
+        if endpoint['queries'] > endpoint['query_budget']:
+            violations.append(f"{label}: {endpoint['queries']} queries > budget {endpoint['query_budget']}")
+        p99 = endpoint['latency_ms']['p99']
+        if max_p99_ms is not None and p99 is not None and p99 > max_p99_ms:
+            violations.append(f"{label}: p99 {p99} ms > {max_p99_ms} ms")
+    return violations
+
+
+class Command(BaseCommand):
+    help = 'REST 엔드포인트를 데이터 크기별로 측정하고, 쿼리 예산이나 지연 기준을 넘으면 실패합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000', help='쉼표로 구분한 사용자 수')
+        parser.add_argument('--rooms-per-user', type=float, default=0.1, help='사용자 수 대비 채팅방 수 비율')
+        parser.add_argument('--participants', type=int, default=50, help='채팅방당 참여자 수')
+        parser.add_argument('--messages', type=int, default=200, help='채팅방당 메시지 수')
+        parser.add_argument('--repeat', type=int, default=20, help='엔드포인트당 요청 횟수')
+        parser.add_argument('--max-p99-ms', type=float, default=None, help='엔드포인트별 p99 지연 상한(ms)')
+        parser.add_argument('--output', help='결과 JSON 을 저장할 파일 경로')
+
+    def handle(self, *args, **options):
+        if 'sqlite' not in settings.DATABASES['default']['ENGINE']:
+            raise CommandError('SQLite 에서만 실행할 수 있습니다. RUNNING_ENV=benchmark 로 실행하세요.')
+        call_command('migrate', verbosity=0)
+
+        results = []
+        for size in self.parse_ints(options['sizes']):
+            benchmark = ApiBenchmark(
+                users=size,
+                rooms=max(1, int(size * options['rooms_per_user'])),
+                participants=options['participants'],
+                messages=options['messages'],
+                repeat=options['repeat']
+            )
+            result = benchmark.run()
+            results.append(result)
+            for endpoint in result['endpoints']:
+                self.stderr.write(f"users={size} {endpoint['name']}: p99 {endpoint['latency_ms']['p99']} ms, "
+                                  f"{endpoint['queries']} queries")
+
+        report = json.dumps({'revision': git_revision(), 'sizes': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(report)
+        self.stdout.write(report)
+
+        violations = list(itertools.chain.from_iterable(
+            find_violations(result, options['max_p99_ms']) for result in results
+        ))
+        if violations:
+            raise CommandError('Budget exceeded:\n' + '\n'.join(violations))
+
+    @staticmethod
+    def parse_ints(value):
+        return [int(item) for item in value.split(',') if item.strip()]
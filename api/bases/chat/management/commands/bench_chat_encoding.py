@@ -0,0 +1,76 @@
+import json
+import time
+import uuid
+
+import arrow
+from django.core.management.base import BaseCommand
+
+from api.versioned.v1.chat.consumer import ChatConsumer
+from common.benchmark import git_revision
+from common.codecs import JSON_CODECS, MsgpackCodec
+
+
+class Command(BaseCommand):
+    help = '채팅 메시지 한 건을 recipients 명에게 보낼 때 수신자별 인코딩과 미리 인코딩한 프레임 전달의 CPU 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=1000, help='방 인원')
+        parser.add_argument('--messages', type=int, default=200, help='측정할 메시지 수')
+        parser.add_argument('--output', help='결과 JSON 을 저장할 파일 경로')
+
+    def handle(self, *args, **options):
+        recipients, messages = options['recipients'], options['messages']
+        events = [self.make_event(index) for index in range(messages)]
+
+        results = []
+        for json_name, json_codec in JSON_CODECS.items():
+            for codec in (json_codec, MsgpackCodec):
+                per_recipient = self.measure(lambda event: [
+                    codec.encode(ChatConsumer.get_chat_frame(event)) for _ in range(recipients)
+                ], events)
+                prepared = self.measure(lambda event: [
+                    event['frames'][codec.name] for _ in range(recipients)
+                ], [dict(event, frames=self.prepare(json_codec, event)) for event in events])
+                # 미리 인코딩하는 쪽은 발신 시점의 인코딩 비용도 포함합니다.
+                sender = self.measure(lambda event: self.prepare(json_codec, event), events)
+                prepared_total = prepared + sender
+
+                results.append({
+                    'json_codec': json_name,
+                    'frame_codec': codec.name,
+                    'recipients': recipients,
+                    'per_recipient_encode_ms_per_message': round(per_recipient / messages * 1000, 4),
+                    'prepared_ms_per_message': round(prepared_total / messages * 1000, 4),
+                    'saved_us_per_recipient': round((per_recipient - prepared_total) / messages / recipients * 1e6, 4),
+                })
+
+        report = json.dumps({'revision': git_revision(), 'results': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(report)
+        self.stdout.write(report)
+
+    @staticmethod
+    def make_event(index):
+        return {
+            'type': 'chat_message',
+            'uid': str(uuid.uuid4()),
+            'room_id': '1',
+            'message': f'안녕하세요 benchmark message {index}',
+            'user_id': str(uuid.uuid4()),
+            'username': f'bench-{index}',
+            'created_at': arrow.now('Asia/Seoul').isoformat()
+        }
+
+    @staticmethod
+    def prepare(json_codec, event):
+        # common.codecs.encode_all 과 같지만, 설정과 관계없이 json_codec 을 지정해 측정합니다.
+        frame = ChatConsumer.get_chat_frame(event)
+        return {json_codec.name: json_codec.encode(frame), MsgpackCodec.name: MsgpackCodec.encode(frame)}
+
+    @staticmethod
+    def measure(handler, events):
+        start = time.process_time()
+        for event in events:
+            handler(event)
+        return time.process_time() - start
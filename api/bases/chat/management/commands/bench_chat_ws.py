@@ -0,0 +1,177 @@
+import asyncio
+import itertools
+import json
+import time
+import uuid
+
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.bases.chat.models import ChatRoom
+from api.bases.chat.persistence import MessagePersister
+from api.bases.user.activity import ActivityTracker
+from api.bases.user.models import User
+from common.benchmark import QueryCounter, git_revision, summarize
+
+BENCH_PREFIX = 'bench'
+
+
+class ChatWebsocketBenchmark:
+    """
+    실제 ASGI application 에 WebsocketCommunicator 로 room_size 명을 접속시키고,
+    senders 명이 초당 rate 건의 속도로 총 messages 건을 보냈을 때의 전달 성능을 측정합니다.
+    """
+    connect_concurrency = 50
+
+    def __init__(self, room_size, senders, rate, messages, timeout=30):
+        self.room_size = room_size
+        self.senders = min(senders, room_size)
+        self.rate = rate
+        self.messages = messages
+        self.timeout = timeout
+        self.sent_at = {}
+        self.latencies = []
+        self.connect_times = []
+        self.query_counter = QueryCounter()
+
+    async def run(self):
+        from api_backend.asgi import application
+
+        room, users = await database_sync_to_async(self.seed)()
+        await database_sync_to_async(self.install_query_counter)()
+        try:
+            semaphore = asyncio.Semaphore(self.connect_concurrency)
+            communicators = await asyncio.gather(*[
+                self.connect(application, semaphore, room, user) for user in users
+            ])
+            self.query_counter.reset()
+
+            started_at = time.perf_counter()
+            receivers = [asyncio.create_task(self.receive(communicator)) for communicator in communicators]
+            await asyncio.gather(*[
+                self.send(communicators[index], range(index, self.messages, self.senders))
+                for index in range(self.senders)
+            ])
+            delivered = sum(await asyncio.gather(*receivers))
+            elapsed = time.perf_counter() - started_at
+
+            # write-behind 로 미뤄진 쿼리까지 메시지당 쿼리 수에 포함합니다.
+            await MessagePersister.instance().flush()
+            await ActivityTracker.instance().flush()
+            query_count = self.query_counter.count
+
+            await asyncio.gather(*[communicator.disconnect() for communicator in communicators])
+        finally:
+            await database_sync_to_async(self.uninstall_query_counter)()
+            await database_sync_to_async(self.cleanup)(room, users)
+
+        return {
+            'room_size': self.room_size,
+            'senders': self.senders,
+            'rate': self.rate,
+            'messages': self.messages,
+            'expected_deliveries': self.messages * self.room_size,
+            'delivered': delivered,
+            'duration_s': round(elapsed, 3),
+            'messages_per_second': round(delivered / elapsed, 1) if elapsed else None,
+            'latency_ms': summarize(self.latencies),
+            'connect_ms': summarize(self.connect_times),
+            'queries_per_message': round(query_count / self.messages, 2) if self.messages else None,
+        }
+
+    def seed(self):
+        prefix = uuid.uuid4().hex[:8]
+        room = ChatRoom.objects.create(title=f'{BENCH_PREFIX}-{prefix}')
+        users = User.objects.bulk_create([
+            User(username=f'{BENCH_PREFIX}-{prefix}-{index}') for index in range(self.room_size)
+        ])
+        return room, users
+
+    def install_query_counter(self):
+        # ORM 호출이 실행되는 sync 스레드의 connection 에 등록해야 합니다.
+        connection.execute_wrappers.append(self.query_counter)
+
+    def uninstall_query_counter(self):
+        connection.execute_wrappers.remove(self.query_counter)
+
+    def cleanup(self, room, users):
+        room.delete()
+        User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    async def connect(self, application, semaphore, room, user):
+        async with semaphore:
+            communicator = WebsocketCommunicator(application, f'/ws/room/{room.id}/messages/{user.id}')
+            start = time.perf_counter()
+            connected, _ = await communicator.connect(timeout=self.timeout)
+            self.connect_times.append((time.perf_counter() - start) * 1000)
+            if not connected:
+                raise CommandError(f'Connection failed for user {user.id}')
+            return communicator
+
+    async def send(self, communicator, sequences):
+        interval = self.senders / self.rate
+        for sequence in sequences:
+            self.sent_at[sequence] = time.perf_counter()
+            await communicator.send_json_to({'message': f'{BENCH_PREFIX} {sequence}'})
+            await asyncio.sleep(interval)
+
+    async def receive(self, communicator):
+        received = 0
+        while received < self.messages:
+            try:
+                frame = await communicator.receive_json_from(timeout=self.timeout)
+            except asyncio.TimeoutError:
+                break
+            text = frame.get('message', '')
+            if not text.startswith(f'{BENCH_PREFIX} '):
+                continue
+            sequence = int(text.split()[1])
+            self.latencies.append((time.perf_counter() - self.sent_at[sequence]) * 1000)
+            received += 1
+        return received
+
+
+class Command(BaseCommand):
+    help = 'ChatConsumer 를 인메모리 channel layer / SQLite 에서 부하 측정하고 결과를 JSON 으로 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--room-sizes', default='10,100', help='쉼표로 구분한 방 인원 (예: 10,100,1000)')
+        parser.add_argument('--senders', default='1,10', help='쉼표로 구분한 동시 발신자 수')
+        parser.add_argument('--rates', default='50', help='쉼표로 구분한 방 전체 초당 메시지 수')
+        parser.add_argument('--messages', type=int, default=100, help='시나리오당 전송할 메시지 수')
+        parser.add_argument('--timeout', type=float, default=30, help='프레임 수신 대기 시간(초)')
+        parser.add_argument('--output', help='결과 JSON 을 저장할 파일 경로')
+
+    def handle(self, *args, **options):
+        if 'sqlite' not in settings.DATABASES['default']['ENGINE']:
+            raise CommandError('SQLite 에서만 실행할 수 있습니다. RUNNING_ENV=benchmark 로 실행하세요.')
+        call_command('migrate', verbosity=0)
+
+        scenarios = itertools.product(
+            self.parse_ints(options['room_sizes']),
+            self.parse_ints(options['senders']),
+            self.parse_ints(options['rates'])
+        )
+        results = []
+        for room_size, senders, rate in scenarios:
+            if senders > room_size:
+                continue
+            benchmark = ChatWebsocketBenchmark(room_size, senders, rate, options['messages'], options['timeout'])
+            result = asyncio.run(benchmark.run())
+            results.append(result)
+            self.stderr.write(f"room_size={room_size} senders={senders} rate={rate} "
+                              f"-> {result['messages_per_second']} msg/s, p99 {result['latency_ms']['p99']} ms")
+
+        report = json.dumps({'revision': git_revision(), 'scenarios': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(report)
+        self.stdout.write(report)
+
+    @staticmethod
+    def parse_ints(value):
+        return [int(item) for item in value.split(',') if item.strip()]
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from api.bases.chat.models import Message
+from api.bases.chat.search import get_document, get_search_backend
+
+
+class Command(BaseCommand):
+    help = '이미 저장된 메시지를 id 순서대로 나눠 검색 색인에 추가합니다. (새 메시지는 저장 시 자동으로 색인됩니다.)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--room', type=int, help='특정 채팅방만 색인')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 색인할 메시지 수')
+        parser.add_argument('--after', type=int, default=0, help='이 id 이후 메시지부터 색인 (중단한 작업 이어서 실행)')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        query = Message.objects.order_by('id')
+        if options['room']:
+            query = query.filter(chat_room=options['room'])
+
+        last_id, indexed = options['after'], 0
+        while True:
+            rows = list(
+                query.filter(id__gt=last_id).values_list('id', 'chat_room_id', 'content')[:options['batch_size']]
+            )
+            if not rows:
+                break
+            backend.index([(message_id, room_id, get_document(content)) for message_id, room_id, content in rows])
+            last_id = rows[-1][0]
+            indexed += len(rows)
+            self.stdout.write(f'indexed {indexed} messages (last id {last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} messages'))
@@ -0,0 +1,21 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.bases.chat.retention import RetentionSweeper
+
+
+class Command(BaseCommand):
+    help = '오래된 채팅방 참여 정보, 끊긴 접속 상태, 유휴 / 삭제된 채팅방 캐시를 정리하고 정리한 수를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participant-retention', type=int, help='이 시간(초) 동안 활동이 없는 참여 정보를 삭제')
+        parser.add_argument('--batch-size', type=int, help='한 번에 확인 / 삭제할 건수')
+        parser.add_argument('--room', type=int, action='append', help='특정 채팅방의 presence / history 만 처리')
+
+    def handle(self, *args, **options):
+        sweeper = RetentionSweeper(
+            interval=0, batch_size=options['batch_size'], participant_retention=options['participant_retention'],
+            room_ids=options['room']
+        )
+        self.stdout.write(json.dumps(sweeper.sweep(), indent=2))
@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-18 09:12
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def gen_uid(apps, schema_editor):
+    Message = apps.get_model('chat', 'Message')
+    for message in Message.objects.filter(uid__isnull=True).only('id'):
+        message.uid = uuid.uuid4()
+        message.save(update_fields=['uid'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='uid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(gen_uid, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='message',
+            name='uid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
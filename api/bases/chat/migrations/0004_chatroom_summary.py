@@ -0,0 +1,50 @@
+# Generated by Django 5.1 on 2026-10-18 11:40
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Left
+
+
+def backfill_summaries(apps, schema_editor):
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    Message = apps.get_model('chat', 'Message')
+    room_messages = Message.objects.filter(chat_room=OuterRef('pk'))
+    latest = room_messages.order_by('-created_at', '-id')
+    ChatRoom.objects.update(
+        message_count=Coalesce(Subquery(
+            room_messages.order_by().values('chat_room').annotate(count=Count('id')).values('count')
+        ), 0),
+        last_message_preview=Coalesce(
+            Subquery(latest.annotate(preview=Left('content', 100)).values('preview')[:1]), models.Value('')
+        ),
+    )
+    ChatRoom.objects.filter(message_count__gt=0).update(
+        last_message_at=Subquery(latest.values('created_at')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_message_room_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='chatroom',
+            name='last_message_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-18 13:05
+
+from django.db import migrations
+
+# 검색 색인은 DB 별 구문(FTS5 가상 테이블 / FULLTEXT)이 달라 모델 대신 직접 생성합니다.
+CREATE_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE chat_message_search USING fts5(room, tokens, tokenize = 'unicode61 remove_diacritics 0')"
+    ],
+    'mysql': [
+        'CREATE TABLE chat_message_search ('
+        ' message_id BIGINT NOT NULL PRIMARY KEY,'
+        ' chat_room_id INT NOT NULL,'
+        ' tokens LONGTEXT NOT NULL,'
+        ' KEY chat_message_search_room_idx (chat_room_id, message_id),'
+        ' FULLTEXT KEY chat_message_search_tokens_idx (tokens) WITH PARSER ngram'
+        ') ENGINE=InnoDB DEFAULT CHARSET=utf8mb4'
+    ],
+}
+DROP_SQL = ['DROP TABLE IF EXISTS chat_message_search']
+
+
+def create_search_table(apps, schema_editor):
+    # 기존 메시지는 rebuild_message_search 명령으로 색인합니다.
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_chatroom_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -1,39 +1,133 @@
+import uuid
 from datetime import timedelta, timezone
 
 import arrow
-from django.db import models
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone as django_timezone
 
+from api.bases.chat.archive import MessageArchive
 from api.bases.user.models import User
+from common.caches import LocalTTLCache
+from common.designpatterns import dotdict
+
+room_record_cache = LocalTTLCache(settings.LOCAL_RECORD_CACHE_MAX_SIZE, settings.LOCAL_RECORD_CACHE_TTL)
 
 
 class ChatRoom(models.Model):
+    preview_length = 100
+
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
-    last_message_at = models.DateTimeField(auto_now=True)
+    # 채팅방 목록용 요약 정보. 메시지가 저장될 때 apply_message_summaries 로 갱신됩니다.
+    last_message_at = models.DateTimeField(default=django_timezone.now)
+    last_message_preview = models.CharField(max_length=100, blank=True, default='')
+    message_count = models.PositiveIntegerField(default=0)
+    # archive 세그먼트로 옮긴 가장 최근 메시지 시각. archive_messages 명령이 갱신하며, 없으면 세그먼트를 읽지 않습니다.
+    archived_until = models.DateTimeField(null=True, blank=True)
 
     @classmethod
     def room_exists(cls, room_id):
         return cls.objects.filter(id=room_id).exists()
+
+    @classmethod
+    def get_cached(cls, room_id):
+        """
+        접속 경로에서 사용하는 가벼운 채팅방 레코드(id, title, archived_until)를 반환합니다.
+        """
+        def load():
+            room = cls.objects.only('id', 'title', 'archived_until').get(id=room_id)
+            return dotdict(id=room.id, title=room.title, archived_until=room.archived_until)
+
+        return room_record_cache.get_or_set(str(room_id), load)
+
+    @classmethod
+    def has_archive(cls, room_id):
+        """archive 세그먼트가 있는 채팅방인지 로컬 캐시의 레코드로 확인합니다."""
+        try:
+            return cls.get_cached(room_id).archived_until is not None
+        except cls.DoesNotExist:
+            return False
+
+    @staticmethod
+    def get_version_names(room_id):
+        """채팅방 목록 / 상세 응답의 ETag 에 사용하는 버전 리소스 이름"""
+        return ['chat:rooms', f'chat:room:{room_id}']
+
+    @classmethod
+    def apply_message_summaries(cls, messages):
+        """
+        저장된 메시지 목록을 채팅방별로 묶어 메시지 수 / 마지막 메시지 / 마지막 활동 시각을 갱신합니다.
+
+        채팅방당 UPDATE 한 번이며, 늦게 저장된 이전 메시지가 최신 미리보기를 덮어쓰지 않습니다.
+        """
+        rooms = {}
+        for message in messages:
+            count, latest = rooms.get(message.chat_room_id, (0, message))
+            rooms[message.chat_room_id] = (count + 1, max(latest, message, key=lambda item: item.created_at))
+
+        for room_id, (count, latest) in rooms.items():
+            is_newer = Q(last_message_at__lte=latest.created_at)
+            # MySQL 은 SET 절을 왼쪽부터 적용하므로 last_message_at 보다 미리보기를 먼저 갱신합니다.
+            cls.objects.filter(id=room_id).update(
+                last_message_preview=Case(
+                    When(is_newer, then=Value(latest.content[:cls.preview_length])),
+                    default=F('last_message_preview')
+                ),
+                last_message_at=Case(
+                    When(is_newer, then=Value(latest.created_at)),
+                    default=F('last_message_at')
+                ),
+                message_count=F('message_count') + count
+            )
     
 
 class Message(models.Model):
+    uid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     chat_room = models.ForeignKey(ChatRoom, related_name='messages', on_delete=models.CASCADE)
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # write-behind 로 늦게 저장되더라도 수신 시각이 유지되도록 auto_now_add 대신 default 사용
+    created_at = models.DateTimeField(default=django_timezone.now)
 
     @classmethod
-    def get_previous_messages(cls, room_id, last_message_id=None, limit=50):
-        query = cls.objects.filter(chat_room=room_id).order_by('-created_at')
-        if last_message_id:
-            last_message = cls.objects.get(id=last_message_id)
-            query = query.filter(created_at__lt=last_message.created_at)
-        return list(query.values('id', 'content', 'user__username', 'created_at')[:limit])
+    def get_previous_messages(cls, room_id, before=None, limit=50, exclude_uids=None):
+        """
+        (created_at, id) 키셋 기준으로 before 이전 메시지를 최신순으로 조회합니다. (archive 로 옮긴 메시지 포함)
+
+        before 는 (created_at, id) 튜플이며, id 가 None 이면 created_at 만으로 비교합니다.
+        exclude_uids 를 넘기면 이미 반환한 uid 를 제외하며, id 없는 before 와 같은 시각의 메시지도 포함합니다.
+        """
+        query = cls.objects.filter(chat_room=room_id).order_by('-created_at', '-id')
+        if before:
+            created_at, message_id = before
+            if message_id is not None:
+                query = query.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+            elif exclude_uids:
+                query = query.filter(created_at__lte=created_at)
+            else:
+                query = query.filter(created_at__lt=created_at)
+        if exclude_uids:
+            query = query.exclude(uid__in=exclude_uids)
+        messages = list(query.values('id', 'uid', 'content', 'user_id', 'user__username', 'created_at')[:limit])
+
+        if len(messages) < limit and ChatRoom.has_archive(room_id):
+            # DB 에 남은 메시지보다 오래된 구간은 archive 세그먼트에서 이어서 읽습니다.
+            if messages:
+                before = (messages[-1]['created_at'], messages[-1]['id'])
+            messages += MessageArchive().get_previous_messages(room_id, before=before, limit=limit - len(messages))
+        return messages
 
     def __str__(self):
         return f'{self.user.username}: {self.content[:20]}'
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['chat_room', 'created_at', 'id'], name='message_room_created_idx'),
+        ]
+
 
 
 class ChatRoomParticipant(models.Model):
@@ -44,11 +138,15 @@ class ChatRoomParticipant(models.Model):
 
     @classmethod
     def add_user_to_room(cls, room_id, user_id):
-        room = ChatRoom.objects.get(id=room_id)
-        return cls.objects.update_or_create(
-            user_id=user_id,
-            chat_room=room,
-            defaults={'joined_at': arrow.now("Asia/Seoul").datetime}
+        # INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE 한 번으로 참여 정보를 갱신합니다.
+        unique_fields = None
+        if connection.features.supports_update_conflicts_with_target:
+            unique_fields = ['user', 'chat_room']
+        return cls.objects.bulk_create(
+            [cls(user_id=user_id, chat_room_id=room_id)],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=['joined_at', 'last_active']
         )
 
     @classmethod
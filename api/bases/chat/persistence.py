@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import transaction
+
+from api.bases.chat.models import ChatRoom, Message
+from api.bases.chat.search import index_messages
+from common.versions import ResourceVersions
+from common.writebehind import WriteBehindBuffer
+
+
+class MessagePersister(WriteBehindBuffer):
+    """
+    채팅 메시지를 메모리에 모았다가 bulk_create 로 한 번에 저장하는 write-behind 버퍼입니다.
+
+    batch_size 만큼 쌓이거나 flush_interval 초가 지나면 저장하며,
+    워커가 종료될 때 남은 메시지를 모두 저장합니다(ChatConfig.ready 참고).
+    """
+    name = 'Message'
+
+    def __init__(self, batch_size=None, flush_interval=None, max_pending=None):
+        super().__init__(
+            flush_interval or settings.CHAT_PERSIST_FLUSH_INTERVAL,
+            batch_size=batch_size or settings.CHAT_PERSIST_BATCH_SIZE,
+            max_pending=max_pending or settings.CHAT_PERSIST_MAX_PENDING,
+        )
+
+    def enqueue(self, **fields):
+        self.add(Message(**fields))
+
+    def save(self, batch):
+        with transaction.atomic():
+            # uid 가 unique 이므로 재시도 중 이미 저장된 행은 무시됩니다.
+            Message.objects.bulk_create(batch, batch_size=self.batch_size, ignore_conflicts=True)
+            ChatRoom.apply_message_summaries(batch)
+            # 검색 색인은 커밋 후에 따로 처리해 색인 실패가 메시지 저장을 되돌리지 않도록 합니다.
+            transaction.on_commit(lambda: index_messages(batch))
+            room_ids = {message.chat_room_id for message in batch}
+            ResourceVersions().bump_on_commit(
+                *{name for room_id in room_ids for name in ChatRoom.get_version_names(room_id)}
+            )
+        return len(batch)
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone as django_timezone
+
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from common.designpatterns import SingletonClass
+from common.history import RoomMessageHistory
+from common.presence import RoomPresence
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionSweeper(SingletonClass):
+    """
+    정상 종료되지 않은 연결과 더 이상 쓰이지 않는 채팅방 데이터를 정리합니다.
+
+      - participants: last_active 가 보관 기간을 넘었고 현재 접속 중이 아닌 ChatRoomParticipant 삭제
+      - presence: heartbeat 가 끊긴 연결을 만료시키고 방별 접속자 수(members hash)를 갱신
+      - history: TTL 이 없는 메시지 캐시에 TTL 을 설정하고, 삭제된 채팅방의 캐시는 삭제
+
+    한 번에 batch_size 건씩 짧은 쿼리 / 명령으로 나눠 처리하므로 테이블을 오래 잠그지 않습니다.
+    room_ids 를 지정하면 presence / history 는 해당 채팅방의 key 만 정리합니다. (기본: 전체 key)
+    sweep_chat_retention 명령으로 실행하거나, CHAT_SWEEP_INTERVAL 을 지정하면 consumer 가 실행 중인
+    워커에서 주기적으로 실행합니다. (여러 워커 중 interval 마다 한 곳에서만 실행)
+    """
+    lock_key = 'chat:retention:lock'
+    history_key_pattern = RoomMessageHistory.key_format.format(room_id='*')
+
+    def __init__(self, interval=None, batch_size=None, participant_retention=None, room_ids=None):
+        self.interval = interval if interval is not None else settings.CHAT_SWEEP_INTERVAL
+        self.batch_size = batch_size or settings.CHAT_SWEEP_BATCH_SIZE
+        self.participant_retention = participant_retention or settings.CHAT_PARTICIPANT_RETENTION
+        self.room_ids = room_ids
+        self.presence = RoomPresence()
+        self.history = RoomMessageHistory()
+        self._timer_task = None
+
+    def sweep(self):
+        """정리한 항목 수를 dict 로 반환합니다."""
+        report = {
+            'participants_deleted': self.sweep_participants(),
+            'presence_expired': self.sweep_presence(),
+        }
+        report.update(self.sweep_history())
+        return report
+
+    def sweep_participants(self):
+        cutoff = django_timezone.now() - timedelta(seconds=self.participant_retention)
+        stale = ChatRoomParticipant.objects.filter(last_active__lt=cutoff)
+
+        deleted, last_id = 0, 0
+        while True:
+            # pk 순서로 batch_size 건씩 확인하고, 삭제는 pk 목록으로만 합니다.
+            rows = list(stale.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'chat_room_id', 'user_id'
+            )[:self.batch_size])
+            if not rows:
+                return deleted
+            last_id = rows[-1][0]
+
+            online = {room_id: set(self.presence.get_user_ids(room_id)) for room_id in {row[1] for row in rows}}
+            ids = [pk for pk, room_id, user_id in rows if str(user_id) not in online[room_id]]
+            if ids:
+                # 그 사이 다시 접속해 last_active 가 갱신된 행은 남깁니다.
+                deleted += stale.filter(id__in=ids).delete()[0]
+
+    def sweep_presence(self):
+        if self.room_ids is not None:
+            room_ids = [str(room_id) for room_id in self.room_ids]
+        else:
+            room_ids = [room_id.decode() for room_id in self.presence.client.hkeys(self.presence.members_key)]
+        return sum(self.presence.sweep(room_id) for room_id in room_ids)
+
+    def get_history_keys(self):
+        client = self.history.client
+        if self.room_ids is None:
+            return client.scan_iter(match=self.history_key_pattern, count=self.batch_size)
+        keys = [self.history.get_key(room_id) for room_id in self.room_ids]
+        pipeline = client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.exists(key)
+        return iter([key.encode() for key, exists in zip(keys, pipeline.execute()) if exists])
+
+    def sweep_history(self):
+        report = {'history_expiry_set': 0, 'history_deleted': 0}
+        keys = self.get_history_keys()
+        while True:
+            batch = list(islice(keys, self.batch_size))
+            if not batch:
+                return report
+            expiry_set, deleted = self._sweep_history_keys(batch)
+            report['history_expiry_set'] += expiry_set
+            report['history_deleted'] += deleted
+
+    def _sweep_history_keys(self, keys):
+        keys = {key.decode().split(':')[1]: key for key in keys}
+        existing = {str(room_id) for room_id in ChatRoom.objects.filter(
+            id__in=[room_id for room_id in keys if room_id.isdigit()]
+        ).values_list('id', flat=True)}
+        live = [key for room_id, key in keys.items() if room_id in existing]
+        missing = [key for room_id, key in keys.items() if room_id not in existing]
+
+        client = self.history.client
+        pipeline = client.pipeline(transaction=False)
+        for key in live:
+            pipeline.ttl(key)
+        # TTL 없이 기록된 이전 캐시에는 history TTL 을 설정합니다.
+        no_ttl = [key for key, ttl in zip(live, pipeline.execute()) if ttl == -1]
+
+        pipeline = client.pipeline(transaction=False)
+        for key in no_ttl:
+            pipeline.expire(key, self.history.ttl)
+        if missing:
+            pipeline.delete(*missing)
+        pipeline.execute()
+        return len(no_ttl), len(missing)
+
+    def sweep_if_due(self):
+        if not cache.add(self.lock_key, 1, self.interval):
+            return None
+        report = self.sweep()
+        logger.info(f'Retention sweep: {report}')
+        return report
+
+    def ensure_started(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        if self._timer_task and not self._timer_task.done() and self._timer_task.get_loop() is loop:
+            return
+        self._timer_task = loop.create_task(self._run_timer())
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await database_sync_to_async(self.sweep_if_due)()
+            except Exception as e:
+                logger.error(f'Retention sweep error: {str(e)}')
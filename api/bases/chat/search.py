@@ -0,0 +1,293 @@
+import logging
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from rest_framework.exceptions import NotFound
+
+from api.bases.chat.models import Message
+from common.exceptions import InvalidSearchQuery
+from common.pagination import RankCursor
+
+# 한글(자모 포함) / 가나 / 한자
+CJK_CHARS = '\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7af'
+CJK_PATTERN = re.compile(f'[{CJK_CHARS}]+')
+PART_PATTERN = re.compile(f'[{CJK_CHARS}]+|[^{CJK_CHARS}]+')
+WORD_PATTERN = re.compile(r'\w+')
+MAX_MESSAGE_ID = 2 ** 63 - 1
+
+logger = logging.getLogger(__name__)
+
+
+def split_words(text):
+    """단어를 한글 등 CJK 구간과 그 외 구간으로 나눕니다. ('hello안녕' -> hello, 안녕)"""
+    for word in WORD_PATTERN.findall(text.lower()):
+        yield from PART_PATTERN.findall(word)
+
+
+def is_cjk(part):
+    return CJK_PATTERN.fullmatch(part) is not None
+
+
+def get_bigrams(part):
+    if len(part) == 1:
+        return [part]
+    return [part[index:index + 2] for index in range(len(part) - 1)]
+
+
+def tokenize(text):
+    """
+    색인용 토큰 목록을 반환합니다.
+
+    한글은 띄어쓰기와 조사 때문에 단어 단위로는 찾기 어려우므로 2글자씩 겹쳐 자른 bigram 으로,
+    영문 / 숫자는 단어 단위로 색인합니다. ('안녕하세요 hello' -> 안녕 녕하 하세 세요 hello)
+    """
+    tokens = []
+    for part in split_words(text):
+        tokens += get_bigrams(part) if is_cjk(part) else [part]
+    return tokens
+
+
+def get_document(content):
+    return ' '.join(tokenize(content))
+
+
+def get_query_terms(query):
+    """
+    검색어를 (토큰, prefix 여부) 목록으로 변환합니다. 모든 토큰이 포함된 메시지만 검색됩니다.
+
+    한 글자 한글과 영문 / 숫자 단어는 앞부분이 일치하는 토큰도 찾도록 prefix 로 검색합니다.
+    """
+    if not query or len(query) > settings.CHAT_SEARCH_MAX_QUERY_LENGTH:
+        raise InvalidSearchQuery
+
+    terms = []
+    for part in split_words(query):
+        if is_cjk(part) and len(part) > 1:
+            terms += [(token, False) for token in get_bigrams(part)]
+        else:
+            terms.append((part, True))
+    if not terms:
+        raise InvalidSearchQuery
+    return list(dict.fromkeys(terms))
+
+
+class SearchBackend:
+    """
+    메시지 검색 색인 테이블(chat_message_search)을 다루는 DB 별 구현의 기반 클래스입니다.
+
+    색인 문서는 tokenize 결과를 공백으로 이어 붙인 문자열이며, message id 를 키로 저장합니다.
+    """
+    table = 'chat_message_search'
+    id_column = 'message_id'
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    def cursor(self):
+        return connections[self.using].cursor()
+
+    def index(self, rows):
+        """(message_id, room_id, 색인 문서) 목록을 저장합니다. 같은 message_id 는 덮어씁니다."""
+        raise NotImplementedError
+
+    def delete_room(self, room_id):
+        raise NotImplementedError
+
+    def delete_messages(self, message_ids):
+        with self.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE {self.id_column} IN ({", ".join(["%s"] * len(message_ids))})',
+                list(message_ids)
+            )
+
+    def match(self, room_id, terms, max_id, limit):
+        """
+        max_id 이하에서 terms 를 모두 포함하는 최근 메시지 limit 건의 (message_id, 색인 문서) 목록을 반환합니다.
+        """
+        raise NotImplementedError
+
+
+class SqliteSearchBackend(SearchBackend):
+    """SQLite FTS5 가상 테이블. rowid 가 message id 입니다."""
+    id_column = 'rowid'
+
+    def index(self, rows):
+        with self.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (rowid, room, tokens) VALUES (%s, %s, %s)',
+                [(message_id, str(room_id), document) for message_id, room_id, document in rows]
+            )
+
+    def delete_room(self, room_id):
+        with self.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE room = %s', [str(room_id)])
+
+    @staticmethod
+    def get_match_expression(room_id, terms):
+        tokens = ' AND '.join(f'"{token}"*' if prefix else f'"{token}"' for token, prefix in terms)
+        return f'room : "{room_id}" AND tokens : ({tokens})'
+
+    def match(self, room_id, terms, max_id, limit):
+        with self.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, tokens FROM {self.table} '
+                f'WHERE {self.table} MATCH %s AND rowid <= %s ORDER BY rowid DESC LIMIT %s',
+                [self.get_match_expression(room_id, terms), max_id, limit]
+            )
+            return cursor.fetchall()
+
+
+class MysqlSearchBackend(SearchBackend):
+    """
+    InnoDB FULLTEXT 색인 (ngram parser).
+
+    색인 문서가 이미 bigram 이므로 ngram_token_size 는 기본값 2 를 사용합니다.
+    """
+    def index(self, rows):
+        with self.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (message_id, chat_room_id, tokens) VALUES (%s, %s, %s) '
+                'ON DUPLICATE KEY UPDATE tokens = VALUES(tokens)',
+                list(rows)
+            )
+
+    def delete_room(self, room_id):
+        with self.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE chat_room_id = %s', [room_id])
+
+    @staticmethod
+    def get_match_expression(terms):
+        return ' '.join(f'+{token}*' if prefix else f'+"{token}"' for token, prefix in terms)
+
+    def match(self, room_id, terms, max_id, limit):
+        expression = self.get_match_expression(terms)
+        with self.cursor() as cursor:
+            cursor.execute(
+                f'SELECT message_id, tokens FROM {self.table} '
+                'WHERE chat_room_id = %s AND message_id <= %s AND MATCH (tokens) AGAINST (%s IN BOOLEAN MODE) '
+                'ORDER BY message_id DESC LIMIT %s',
+                [room_id, max_id, expression, limit]
+            )
+            return cursor.fetchall()
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SqliteSearchBackend,
+    'mysql': MysqlSearchBackend,
+}
+
+
+def is_search_supported(using='default'):
+    return connections[using].vendor in SEARCH_BACKENDS
+
+
+def get_search_backend(using='default'):
+    vendor = connections[using].vendor
+    if vendor not in SEARCH_BACKENDS:
+        raise ImproperlyConfigured(f'Message search is not supported on {vendor}')
+    return SEARCH_BACKENDS[vendor](using)
+
+
+def index_messages(messages):
+    """
+    저장한 메시지를 검색 색인에 추가하고 색인한 수를 반환합니다.
+
+    메시지 저장 트랜잭션이 커밋된 뒤 호출되며, 색인에 실패해도 메시지 저장에는 영향을 주지 않습니다.
+    (누락된 메시지는 rebuild_message_search 명령으로 다시 색인합니다.)
+    bulk_create(ignore_conflicts=True) 는 id 를 채워주지 않으므로 uid 로 id 를 한 번에 조회합니다.
+    """
+    if not is_search_supported():
+        return 0
+    try:
+        ids = dict(Message.objects.filter(uid__in=[message.uid for message in messages]).values_list('uid', 'id'))
+        rows = [
+            (ids[message.uid], message.chat_room_id, get_document(message.content))
+            for message in messages if message.uid in ids
+        ]
+        if rows:
+            get_search_backend().index(rows)
+        return len(rows)
+    except Exception as e:
+        logger.error(f'Message search index error: {str(e)}')
+        return 0
+
+
+def rank(candidates, terms, k1=1.2, b=0.75):
+    """
+    후보 (message_id, 색인 문서) 목록에 BM25 점수를 매겨 (message_id, 점수) 목록을 관련도순으로 반환합니다.
+
+    DB 의 점수(bm25 / MATCH)는 색인 전체 통계에 따라 요청마다 달라질 수 있어 cursor 키셋으로 쓸 수 없으므로,
+    고정된 후보 집합 안에서 직접 계산합니다. 후보는 모두 terms 를 포함하므로 idf 는 생략합니다.
+    """
+    documents = [(message_id, document.split()) for message_id, document in candidates]
+    average_length = sum(len(tokens) for _, tokens in documents) / len(documents) or 1
+
+    scored = []
+    for message_id, tokens in documents:
+        norm = k1 * (1 - b + b * len(tokens) / average_length)
+        score = 0.0
+        for term, prefix in terms:
+            frequency = sum(1 for token in tokens if token.startswith(term)) if prefix else tokens.count(term)
+            score += frequency * (k1 + 1) / (frequency + norm)
+        scored.append((message_id, score))
+    return sorted(scored, key=lambda item: (-item[1], -item[0]))
+
+
+def search_messages(room_id, query, cursor=None, limit=20):
+    """
+    채팅방 메시지를 관련도순으로 검색하고 (메시지 목록, next_cursor) 를 반환합니다.
+
+    방 크기와 관계없이 응답 시간이 일정하도록, 검색어를 포함하는 메시지를 최신순으로
+    CHAT_SEARCH_MAX_CANDIDATES 건씩 구간으로 나눠 구간 안에서만 순위를 매깁니다.
+    최근 구간의 결과를 모두 넘기면 그 이전 구간으로 이어지므로, 오래된 메시지도 끝까지 페이지를 넘겨 조회할 수 있습니다.
+    구간의 최대 id 를 cursor 에 담아 이후 페이지에서는 새로 저장된 메시지가 후보에 끼어들지 않습니다.
+    """
+    terms = get_query_terms(query)
+    try:
+        room_id = int(room_id)
+    except ValueError:
+        raise NotFound
+    score, message_id, window = RankCursor.decode(cursor) if cursor else (None, None, MAX_MESSAGE_ID)
+    window_size = settings.CHAT_SEARCH_MAX_CANDIDATES
+    backend = get_search_backend()
+
+    page, next_cursor = [], None
+    while len(page) < limit:
+        candidates = backend.match(room_id, terms, window, window_size)
+        if not candidates:
+            next_cursor = None
+            break
+        window = max(candidate_id for candidate_id, _ in candidates)
+
+        ranked = rank(candidates, terms)
+        if score is not None:
+            ranked = [
+                (candidate_id, candidate_score) for candidate_id, candidate_score in ranked
+                if (-candidate_score, -candidate_id) > (-score, -message_id)
+            ]
+        remaining = limit - len(page)
+        page += ranked[:remaining]
+
+        if len(ranked) > remaining:
+            last_id, last_score = page[-1]
+            next_cursor = RankCursor.encode(last_score, last_id, window)
+            break
+        if len(candidates) < window_size:
+            next_cursor = None
+            break
+        # 현재 구간을 모두 반환했으면 그보다 오래된 구간의 첫 페이지로 넘어갑니다.
+        score, message_id = None, None
+        window = min(candidate_id for candidate_id, _ in candidates) - 1
+        next_cursor = RankCursor.encode(None, None, window)
+
+    messages = {
+        message['id']: message
+        for message in Message.objects.filter(id__in=[candidate_id for candidate_id, _ in page]).values(
+            'id', 'uid', 'content', 'user_id', 'user__username', 'created_at'
+        )
+    }
+    results = [dict(messages[candidate_id], score=candidate_score)
+               for candidate_id, candidate_score in page if candidate_id in messages]
+    return results, next_cursor
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.bases.chat.models import ChatRoom, room_record_cache
+from api.bases.chat.search import get_search_backend, is_search_supported
+from common.versions import ResourceVersions
+
+
+@receiver([post_save, post_delete], sender=ChatRoom)
+def invalidate_room_record(sender, instance, **kwargs):
+    room_record_cache.delete(str(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ChatRoom)
+def bump_room_version(sender, instance, **kwargs):
+    ResourceVersions().bump_on_commit(*ChatRoom.get_version_names(instance.pk))
+
+
+@receiver(post_delete, sender=ChatRoom)
+def delete_room_search_index(sender, instance, using='default', **kwargs):
+    # 검색을 지원하지 않는 DB 에서는 색인 테이블이 없습니다.
+    if is_search_supported(using):
+        get_search_backend(using).delete_room(instance.pk)
@@ -0,0 +1,44 @@
+import arrow
+from django.conf import settings
+
+from api.bases.user.models import User
+from common.versions import ResourceVersions
+from common.writebehind import WriteBehindBuffer
+
+
+class ActivityTracker(WriteBehindBuffer):
+    """
+    사용자별 마지막 활동 시각을 메모리에 모았다가 flush_interval 마다 bulk_update 로 저장합니다.
+
+    같은 주기 안에서는 사용자당 가장 최근 시각 하나만 남으므로, 사용자당 최대 한 번만 UPDATE 됩니다.
+    """
+    name = 'Activity'
+
+    def __init__(self, flush_interval=None):
+        super().__init__(flush_interval or settings.USER_ACTIVITY_FLUSH_INTERVAL)
+
+    # 버퍼는 {user_id: 마지막 활동 시각} dict 입니다.
+    def new_buffer(self):
+        return {}
+
+    def put(self, buffer, item):
+        user_id, seen_at = item
+        buffer[user_id] = seen_at
+
+    def merge(self, failed, buffer):
+        # 실패한 시각보다 그 사이 새로 기록된 시각을 우선합니다.
+        return {**failed, **buffer}
+
+    def drop_oldest(self, buffer, count):
+        for user_id in list(buffer)[:count]:
+            del buffer[user_id]
+
+    def record(self, user_id, seen_at=None):
+        self.add((str(user_id), seen_at or arrow.now('Asia/Seoul').datetime))
+
+    def save(self, pending):
+        users = [User(id=user_id, last_active=seen_at) for user_id, seen_at in pending.items()]
+        # UPDATE ... SET last_active = CASE id WHEN ... END WHERE id IN (...)
+        User.objects.bulk_update(users, ['last_active'], batch_size=500)
+        ResourceVersions().bump_on_commit('users')
+        return len(users)
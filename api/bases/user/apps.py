@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class UserConfig(AppConfig):
     name = 'api.bases.user'
+
+    def ready(self):
+        from api.bases.user import signals  # noqa
+        from api.bases.user.activity import ActivityTracker
+
+        # 워커 종료 시 아직 저장되지 않은 활동 시각을 flush 합니다.
+        ActivityTracker.flush_on_exit()
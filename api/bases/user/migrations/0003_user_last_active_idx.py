@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_user_last_active_alter_user_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_active', 'id'], name='user_last_active_idx'),
+        ),
+    ]
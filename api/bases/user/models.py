@@ -1,19 +1,56 @@
 import uuid
 
 import arrow
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from common.caches import LocalTTLCache
+from common.designpatterns import dotdict
+
+user_record_cache = LocalTTLCache(settings.LOCAL_RECORD_CACHE_MAX_SIZE, settings.LOCAL_RECORD_CACHE_TTL)
+
+
 class User(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     username = models.CharField(max_length=100, unique=True)
     connected_at = models.DateTimeField(auto_now_add=True)
     last_active = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def get_cached(cls, user_id):
+        """
+        접속 경로에서 사용하는 가벼운 사용자 레코드(id, username)를 반환합니다.
+
+        프로세스 로컬 캐시에 없을 때만 DB 를 조회하며, 변경/삭제 시 signal 로 무효화됩니다.
+        """
+        def load():
+            user = cls.objects.only('id', 'username').get(id=user_id)
+            return dotdict(id=user.id, username=user.username)
+
+        return user_record_cache.get_or_set(str(user_id), load)
+
+    @classmethod
+    def get_active_users(cls, since, before=None, limit=50):
+        """
+        since 이후 활동한 사용자를 (last_active, id) 키셋 기준 최근 활동순으로 조회합니다.
+        """
+        query = cls.objects.filter(last_active__gte=since).order_by('-last_active', '-id')
+        if before:
+            last_active, user_id = before
+            query = query.filter(Q(last_active__lt=last_active) | Q(last_active=last_active, id__lt=user_id))
+        return list(query[:limit])
+
     def update_last_active(self):
         self.last_active = arrow.now('Asia/Seoul').datetime
-        self.save()
+        self.save(update_fields=['last_active'])
 
 
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_active', 'id'], name='user_last_active_idx'),
+        ]
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.bases.user.models import User, user_record_cache
+from common.versions import ResourceVersions
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_record(sender, instance, **kwargs):
+    user_record_cache.delete(str(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_version(sender, instance, **kwargs):
+    ResourceVersions().bump_on_commit('users')
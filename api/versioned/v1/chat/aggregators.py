@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from api.versioned.v1.chat.metrics import group_send
+from common.designpatterns import SingletonClass
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceAggregator(SingletonClass):
+    """
+    채팅방 입장/퇴장 이벤트를 window 초 동안 모아 presence_delta 이벤트 하나로 전송합니다.
+
+    접속자가 min_users 미만인 작은 방은 기존처럼 user_join / user_leave 를 즉시 전송합니다.
+    """
+
+    def __init__(self, window=None, min_users=None, channel_layer=None):
+        self.window = window if window is not None else settings.CHAT_PRESENCE_COALESCE_WINDOW
+        self.min_users = min_users if min_users is not None else settings.CHAT_PRESENCE_COALESCE_MIN_USERS
+        self._channel_layer = channel_layer
+        self._pending = {}
+        self._flush_tasks = {}
+
+    @property
+    def channel_layer(self):
+        if self._channel_layer is None:
+            self._channel_layer = get_channel_layer()
+        return self._channel_layer
+
+    async def publish(self, group_name, event_type, user, connected_users_count):
+        if connected_users_count < self.min_users and group_name not in self._pending:
+            await group_send(self.channel_layer, group_name, {
+                'type': event_type,
+                'user_id': str(user.id),
+                'username': user.username,
+                'connected_users_count': connected_users_count
+            })
+            return
+
+        pending = self._pending.setdefault(group_name, {'joined': {}, 'left': {}})
+        pending['connected_users_count'] = connected_users_count
+        user_id = str(user.id)
+        added, removed = ('joined', 'left') if event_type == 'user_join' else ('left', 'joined')
+        # window 안에서 입장 후 퇴장(또는 그 반대)한 사용자는 서로 상쇄됩니다.
+        if pending[removed].pop(user_id, None) is None:
+            pending[added][user_id] = user.username
+
+        if group_name not in self._flush_tasks:
+            self._flush_tasks[group_name] = asyncio.create_task(self._flush_later(group_name))
+
+    async def _flush_later(self, group_name):
+        try:
+            await asyncio.sleep(self.window)
+            await self.flush(group_name)
+        finally:
+            self._flush_tasks.pop(group_name, None)
+
+    async def flush(self, group_name):
+        pending = self._pending.pop(group_name, None)
+        if not pending:
+            return
+
+        try:
+            await group_send(self.channel_layer, group_name, {
+                'type': 'presence_delta',
+                'connected_users_count': pending['connected_users_count'],
+                'joined': [{'user_id': user_id, 'username': username}
+                           for user_id, username in pending['joined'].items()],
+                'left': [{'user_id': user_id, 'username': username}
+                         for user_id, username in pending['left'].items()]
+            })
+        except Exception as e:
+            logger.error(f'Error in presence flush: {str(e)}')
@@ -1,11 +1,35 @@
+import asyncio
 import logging
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
 
+from api.bases.chat.retention import RetentionSweeper
+from api.versioned.v1.chat.aggregators import PresenceAggregator
+from api.versioned.v1.chat.metrics import (
+    CONSUMER_HANDLER_SECONDS, GROUP_SIZE, LIVE_SOCKETS, MESSAGES_IN, MESSAGES_OUT, MESSAGES_RATE_LIMITED, group_send
+)
+from api.versioned.v1.chat.outbound import OutboundQueue
 from api.versioned.v1.chat.services import ChatService
+from common.codecs import JsonCodec, MsgpackCodec, encode_all
+from common.metrics import observe_latency
 
 logger = logging.getLogger(__name__)
 
 class ChatConsumer(AsyncJsonWebsocketConsumer):
+    # 이 subprotocol 또는 ?history=batch 로 접속하면 히스토리를 history 프레임 하나로 받습니다.
+    history_subprotocol = 'chat.history.batch'
+    # 이 subprotocol 로 접속하면 JSON 텍스트 프레임 대신 msgpack 바이너리 프레임을 주고받습니다.
+    msgpack_subprotocol = 'msgpack'
+    codec = JsonCodec
+    # 송신 큐가 가득 차 연결을 끊을 때 사용하는 close code
+    slow_consumer_close_code = 4008
+    heartbeat_task = None
+    outbound = None
+    is_live = False
+
+    @observe_latency(CONSUMER_HANDLER_SECONDS, handler='connect')
     async def connect(self):
         try:
             self.room_id = self.scope['url_route']['kwargs']['room_id']
@@ -14,66 +38,157 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
             self.chat_service = ChatService(self.room_id, user_id)
             await self.chat_service.initialize()
+            # flush 타이머는 이벤트 루프에서 시작되므로 worker thread 가 아닌 여기서 기록합니다.
+            self.chat_service.update_user_activity()
 
             await self.channel_layer.group_add(self.group_name, self.channel_name)
-            await self.accept()
-            messages = await self.chat_service.get_previous_messages()
-            for message in messages:
-                await self.send_json(message)
+            subprotocol = self.get_subprotocol()
+            if subprotocol == self.msgpack_subprotocol:
+                self.codec = MsgpackCodec
+            await self.accept(subprotocol)
+            self.is_live = True
+            LIVE_SOCKETS.inc()
+            self.outbound = OutboundQueue(
+                self.send_frame, settings.CHAT_OUTBOUND_QUEUE_SIZE, settings.CHAT_OUTBOUND_OVERFLOW_POLICY
+            )
+            self.outbound.start()
+            messages, cursor = await self.chat_service.get_previous_messages()
+            await self.send_history(messages, cursor)
 
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    'type': 'user_join',
-                    'user_id': str(self.chat_service.user.id),
-                    'username': self.chat_service.user.username,
-                    'connected_users_count': await self.chat_service.get_connected_users_count()
-                }
+            connected_users_count = await self.chat_service.join_presence()
+            GROUP_SIZE.observe(connected_users_count)
+            self.heartbeat_task = asyncio.create_task(self.run_heartbeat())
+            RetentionSweeper.instance().ensure_started()
+            await PresenceAggregator.instance().publish(
+                self.group_name, 'user_join', self.chat_service.user, connected_users_count
             )
 
         except Exception as e:
             logger.error(f"Connection error: {str(e)}")
             await self.close()
 
+    @observe_latency(CONSUMER_HANDLER_SECONDS, handler='disconnect')
     async def disconnect(self, close_code):
+        if self.is_live:
+            self.is_live = False
+            LIVE_SOCKETS.dec()
         try:
-            await self.chat_service.disconnect_user()
+            if self.heartbeat_task:
+                self.heartbeat_task.cancel()
+            if self.outbound:
+                self.outbound.close()
+            connected_users_count = await self.chat_service.leave_presence()
+            GROUP_SIZE.observe(connected_users_count)
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    'type': 'user_leave',
-                    'username': self.chat_service.user.username,
-                    'connected_users_count': await self.chat_service.get_connected_users_count()
-                }
+            await PresenceAggregator.instance().publish(
+                self.group_name, 'user_leave', self.chat_service.user, connected_users_count
             )
         except Exception as e:
             logger.error(f'Error in disconnect: {str(e)}')
 
+    @observe_latency(CONSUMER_HANDLER_SECONDS, handler='receive_json')
     async def receive_json(self, content):
         try:
             message = content.get('message', '').strip()
             if not message:
                 return
 
-            await self.chat_service.update_user_activity()
-            await self.chat_service.cache_message(message)
+            allowed, retry_after = await self.chat_service.consume_rate_limit(self.channel_name)
+            if not allowed:
+                MESSAGES_RATE_LIMITED.inc()
+                await self.send_json({
+                    'type': 'rate_limited',
+                    'error': 'Too many messages',
+                    'retry_after': round(retry_after, 3)
+                })
+                return
+            MESSAGES_IN.inc()
+
+            self.chat_service.update_user_activity()
+            chat_message = await self.chat_service.save_message(message)
 
-            await self.channel_layer.group_send(
+            # 수신자마다 다시 인코딩하지 않도록 codec 별 프레임을 한 번만 만들어 이벤트에 담습니다.
+            await group_send(
+                self.channel_layer,
                 self.group_name,
                 {
                     'type': 'chat_message',
-                    'message': message,
-                    'user_id': str(self.chat_service.user.id),
-                    'username': self.chat_service.user.username
+                    **chat_message,
+                    'frames': encode_all(self.get_chat_frame(chat_message))
                 }
             )
         except Exception as e:
             logger.error(f"Error in receive_json: {str(e)}")
             await self.send_json({'error': 'Failed to process message'})
 
+    async def run_heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.CHAT_PRESENCE_HEARTBEAT_INTERVAL)
+            try:
+                await self.chat_service.heartbeat()
+            except Exception as e:
+                logger.error(f'Error in heartbeat: {str(e)}')
+
+    def get_subprotocol(self):
+        # 하나만 선택할 수 있으므로 msgpack 을 우선합니다. (history batch 는 ?history=batch 로도 요청 가능)
+        subprotocols = self.scope.get('subprotocols', [])
+        for subprotocol in (self.msgpack_subprotocol, self.history_subprotocol):
+            if subprotocol in subprotocols:
+                return subprotocol
+        return None
+
+    def wants_history_batch(self):
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        return query.get('history') == ['batch'] or self.history_subprotocol in self.scope.get('subprotocols', [])
+
+    async def receive(self, text_data=None, bytes_data=None, **kwargs):
+        if bytes_data is not None and self.codec is MsgpackCodec:
+            await self.receive_json(self.codec.decode(bytes_data), **kwargs)
+            return
+        await super().receive(text_data, bytes_data, **kwargs)
+
+    @classmethod
+    async def decode_json(cls, text_data):
+        return JsonCodec.decode(text_data)
+
+    @classmethod
+    async def encode_json(cls, content):
+        return JsonCodec.encode(content)
+
+    async def send_json(self, content, close=False):
+        await self.send_frame(self.codec.encode(content), close=close)
+
+    async def send_frame(self, frame, close=False):
+        """
+        dict 는 연결의 codec 으로 인코딩하고, 이미 인코딩된 str / bytes 는 그대로 전송합니다.
+        """
+        if isinstance(frame, dict):
+            frame = self.codec.encode(frame)
+        if isinstance(frame, bytes):
+            await self.send(bytes_data=frame, close=close)
+        else:
+            await self.send(text_data=frame, close=close)
+
+    async def send_history(self, messages, cursor):
+        if self.wants_history_batch():
+            await self.send_json({
+                'type': 'history',
+                'messages': messages,
+                'next_cursor': cursor
+            })
+            return
+
+        # 기존 클라이언트는 메시지별 프레임으로 받습니다.
+        for message in messages:
+            await self.send_json(message)
+
+    async def enqueue(self, frame):
+        if not self.outbound.put(frame):
+            logger.warning(f'Closing consumer {self.channel_name}: outbound queue is full or closed')
+            await self.close(code=self.slow_consumer_close_code)
+
     async def user_join(self, event):
-        await self.send_json({
+        await self.enqueue({
             "type": "user_join",
             'user_id': event['user_id'],
             "message": f"{event['username']} has joined the chat.",
@@ -81,15 +196,31 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         })
 
     async def user_leave(self, event):
-        await self.send_json({
+        await self.enqueue({
             "type": "user_leave",
             "message": f"{event['username']} has left the chat.",
             "connected_users_count": event['connected_users_count']
         })
 
-    async def chat_message(self, event):
-        await self.send_json({
-            'message': event['message'],
-            'user_id': event['user_id'],
-            'username': event['username']
+    async def presence_delta(self, event):
+        await self.enqueue({
+            "type": "presence_delta",
+            "joined": event['joined'],
+            "left": event['left'],
+            "connected_users_count": event['connected_users_count']
         })
+
+    async def chat_message(self, event):
+        MESSAGES_OUT.inc()
+        frame = event.get('frames', {}).get(self.codec.name)
+        await self.enqueue(frame if frame is not None else self.get_chat_frame(event))
+
+    @staticmethod
+    def get_chat_frame(message):
+        return {
+            'uid': message['uid'],
+            'message': message['message'],
+            'user_id': message['user_id'],
+            'username': message['username'],
+            'created_at': message['created_at']
+        }
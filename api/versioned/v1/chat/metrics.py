@@ -0,0 +1,35 @@
+import time
+
+from common.metrics import Counter, Gauge, Histogram
+
+# 채팅방 인원 버킷
+GROUP_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+CONSUMER_HANDLER_SECONDS = Histogram(
+    'chat_consumer_handler_seconds', 'ChatConsumer handler latency in seconds.', ['handler']
+)
+GROUP_SEND_SECONDS = Histogram(
+    'chat_group_send_seconds', 'channel_layer.group_send latency in seconds.', ['event']
+)
+DB_CALL_SECONDS = Histogram(
+    'chat_db_call_seconds', 'ChatService database_sync_to_async call latency in seconds.', ['call']
+)
+LIVE_SOCKETS = Gauge('chat_live_sockets', 'Open chat WebSocket connections in this worker.')
+MESSAGES_IN = Counter('chat_messages_in_total', 'Chat messages received from clients.')
+MESSAGES_RATE_LIMITED = Counter('chat_messages_rate_limited_total', 'Chat messages rejected by rate limiting.')
+MESSAGES_OUT = Counter('chat_messages_out_total', 'Chat message frames sent to clients.')
+OUTBOUND_QUEUE_DEPTH = Gauge('chat_outbound_queue_depth', 'Frames waiting in per-connection outbound queues.')
+OUTBOUND_DROPPED = Counter(
+    'chat_outbound_dropped_total', 'Frames dropped because an outbound queue was full.', ['policy']
+)
+GROUP_SIZE = Histogram(
+    'chat_group_size', 'Connected users in a room observed on join and leave.', buckets=GROUP_SIZE_BUCKETS
+)
+
+
+async def group_send(channel_layer, group_name, message):
+    start = time.perf_counter()
+    try:
+        await channel_layer.group_send(group_name, message)
+    finally:
+        GROUP_SEND_SECONDS.observe(time.perf_counter() - start, event=message['type'])
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from collections import deque
+
+from api.versioned.v1.chat.metrics import OUTBOUND_DROPPED, OUTBOUND_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_TYPES = ('user_join', 'user_leave', 'presence_delta')
+
+
+class OutboundQueue:
+    """
+    연결별 송신 큐입니다. 핸들러는 put 으로 프레임(dict 또는 인코딩된 str / bytes)을 넣기만 하고,
+    writer 태스크가 순서대로 전송합니다.
+
+    느린 클라이언트 때문에 channel layer 수신이 밀리지 않도록 큐 크기를 max_size 로 제한하며,
+    가득 찼을 때의 동작은 policy 로 정합니다.
+      - drop_oldest: 가장 오래된 프레임을 버립니다.
+      - coalesce_presence: 대기 중인 입장/퇴장 프레임을 먼저 버리고(최신 접속자 수만 남김), 없으면 가장 오래된 프레임을 버립니다.
+        큐가 채팅 프레임으로만 가득 찼을 때 들어온 입장/퇴장 프레임은 채팅 대신 그 프레임을 버립니다.
+      - disconnect: put 이 False 를 반환하며, 호출한 쪽에서 연결을 끊습니다.
+
+    전송에 실패해 writer 가 종료되면 큐를 닫으며, 이후 put 은 정책과 관계없이 False 를 반환합니다.
+    """
+    DROP_OLDEST = 'drop_oldest'
+    COALESCE_PRESENCE = 'coalesce_presence'
+    DISCONNECT = 'disconnect'
+    policies = (DROP_OLDEST, COALESCE_PRESENCE, DISCONNECT)
+
+    def __init__(self, send, max_size, policy=DROP_OLDEST):
+        if policy not in self.policies:
+            raise ValueError(f'Unknown overflow policy: {policy}')
+        self.send = send
+        self.max_size = max_size
+        self.policy = policy
+        self._frames = deque()
+        self._ready = asyncio.Event()
+        self._writer_task = None
+        self.closed = False
+
+    def __len__(self):
+        return len(self._frames)
+
+    def start(self):
+        self._writer_task = asyncio.create_task(self._run_writer())
+
+    def close(self):
+        self.closed = True
+        if self._writer_task:
+            self._writer_task.cancel()
+        OUTBOUND_QUEUE_DEPTH.dec(len(self._frames))
+        self._frames.clear()
+
+    def put(self, frame):
+        """
+        프레임을 큐에 넣습니다. 큐가 닫혔거나 disconnect 정책에서 큐가 가득 찼으면 False 를 반환합니다.
+        """
+        if self.closed:
+            return False
+        if len(self._frames) >= self.max_size:
+            if self.policy == self.DISCONNECT:
+                OUTBOUND_DROPPED.inc(policy=self.policy)
+                return False
+            if not self._drop_one(frame):
+                OUTBOUND_DROPPED.inc(policy=self.policy)
+                return True
+
+        self._frames.append(frame)
+        OUTBOUND_QUEUE_DEPTH.inc()
+        self._ready.set()
+        return True
+
+    @staticmethod
+    def is_presence(frame):
+        return isinstance(frame, dict) and frame.get('type') in PRESENCE_TYPES
+
+    def _drop_one(self, frame):
+        """
+        큐에서 프레임 하나를 버리고 True 를 반환합니다. 들어온 frame 을 대신 버려야 하면 False 를 반환합니다.
+        """
+        if self.policy == self.COALESCE_PRESENCE:
+            for index, queued in enumerate(self._frames):
+                if self.is_presence(queued):
+                    del self._frames[index]
+                    break
+            else:
+                if self.is_presence(frame):
+                    return False
+                self._frames.popleft()
+        else:
+            self._frames.popleft()
+        OUTBOUND_QUEUE_DEPTH.dec()
+        OUTBOUND_DROPPED.inc(policy=self.policy)
+        return True
+
+    async def _run_writer(self):
+        while True:
+            await self._ready.wait()
+            while self._frames:
+                frame = self._frames.popleft()
+                OUTBOUND_QUEUE_DEPTH.dec()
+                try:
+                    await self.send(frame)
+                except Exception as e:
+                    logger.error(f'Error in outbound writer: {str(e)}')
+                    # 남은 프레임은 더 보낼 수 없으므로 버리고, 이후 put 이 실패하도록 큐를 닫습니다.
+                    self.closed = True
+                    OUTBOUND_QUEUE_DEPTH.dec(len(self._frames))
+                    self._frames.clear()
+                    return
+            self._ready.clear()
@@ -1,13 +1,19 @@
 from rest_framework import serializers
 
-from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant, Message
 
 
 class ChatRoomSerializer(serializers.ModelSerializer):
+    # 접속자 수는 view 가 context['member_counts'] 로 한 번에 조회해 넘겨줍니다.
+    member_count = serializers.SerializerMethodField()
 
     class Meta:
         model = ChatRoom
         fields = '__all__'
+        read_only_fields = ('last_message_at', 'last_message_preview', 'message_count', 'archived_until')
+
+    def get_member_count(self, obj):
+        return self.context.get('member_counts', {}).get(str(obj.id), 0)
 
 
 
@@ -15,4 +21,19 @@ class ChatRoomParticipantSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ChatRoomParticipant
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class MessageSerializer(serializers.ModelSerializer):
+    user_id = serializers.UUIDField()
+    username = serializers.CharField(source='user__username')
+
+    class Meta:
+        model = Message
+        fields = ('id', 'uid', 'user_id', 'username', 'content', 'created_at')
+
+
+class MessageSearchSerializer(MessageSerializer):
+    score = serializers.FloatField()
+
+    class Meta(MessageSerializer.Meta):
+        fields = MessageSerializer.Meta.fields + ('score',)
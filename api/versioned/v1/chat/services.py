@@ -1,53 +1,108 @@
+import uuid
+
+import arrow
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
+from django.conf import settings
 
 from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from api.bases.chat.persistence import MessagePersister
+from api.bases.user.activity import ActivityTracker
 from api.bases.user.models import User
+from api.versioned.v1.chat.metrics import DB_CALL_SECONDS
+from common.metrics import observe_latency
 from common.middleware import RedisCacheASGIMiddleware
+from common.presence import RoomPresence
+from common.ratelimit import TokenBucket, consume_all
 
 class ChatService:
     def __init__(self, room_id, user_id):
         self.room_id = room_id
         self.user_id = user_id
         self.redis_middleware = RedisCacheASGIMiddleware(None)
+        self.presence = RoomPresence()
+        self.connection_rate_limit = TokenBucket(
+            'chat:connection', settings.CHAT_RATE_LIMIT_CONNECTION_RATE, settings.CHAT_RATE_LIMIT_CONNECTION_BURST
+        )
+        self.user_rate_limit = TokenBucket(
+            'chat:user', settings.CHAT_RATE_LIMIT_USER_RATE, settings.CHAT_RATE_LIMIT_USER_BURST
+        )
 
 
+    @observe_latency(DB_CALL_SECONDS, call='initialize')
     @database_sync_to_async
     def initialize(self):
-        self.room = ChatRoom.objects.get(id=self.room_id)
-        self.user = User.objects.get(id=self.user_id)
-        self.room.add_user(self.user)
-        self.user.update_last_active()
+        self.room = ChatRoom.get_cached(self.room_id)
+        self.user = User.get_cached(self.user_id)
+        ChatRoomParticipant.add_user_to_room(self.room_id, self.user_id)
 
 
+    @observe_latency(DB_CALL_SECONDS, call='check_room_exists')
     @database_sync_to_async
     def check_room_exists(self):
         return ChatRoom.room_exists(self.room_id)
 
 
-    @database_sync_to_async
-    def disconnect_user(self):
-        self.room.remove_user(self.user)
+    async def join_presence(self):
+        return await sync_to_async(self.presence.join)(self.room_id, self.user_id)
+
+    async def leave_presence(self):
+        return await sync_to_async(self.presence.leave)(self.room_id, self.user_id)
 
+    async def heartbeat(self):
+        await sync_to_async(self.presence.heartbeat)(self.room_id, self.user_id)
+
+    @observe_latency(DB_CALL_SECONDS, call='get_user')
     @database_sync_to_async
     def get_user(self):
         return User.objects.get(id=self.user_id)
 
+    @observe_latency(DB_CALL_SECONDS, call='add_user_to_room')
     @database_sync_to_async
     def add_user_to_room(self):
         return ChatRoomParticipant.add_user_to_room(self.room_id, self.user_id)
 
-    @database_sync_to_async
-    def get_connected_users_count(self):
-        return ChatRoomParticipant.get_connected_users_count(self.room_id)
+    async def get_connected_users_count(self):
+        return await sync_to_async(self.presence.count)(self.room_id)
 
+    @observe_latency(DB_CALL_SECONDS, call='remove_user_from_room')
     @database_sync_to_async
     def remove_user_from_room(self):
         return ChatRoomParticipant.remove_user_from_room(self.room_id, self.user_id)
 
-    @database_sync_to_async
-    def update_user_last_active(self):
-        user = User.objects.get(id=self.user_id)
-        user.update_last_active()
+    async def consume_rate_limit(self, connection_id):
+        """
+        연결별 / 사용자별 버킷에서 메시지 한 건만큼 토큰을 차감합니다. (허용 여부, 재시도 대기 초) 를 반환합니다.
+        """
+        return await sync_to_async(consume_all)([
+            (self.connection_rate_limit, connection_id),
+            (self.user_rate_limit, self.user_id)
+        ])
+
+    def update_user_activity(self):
+        ActivityTracker.instance().record(self.user_id)
+
+    async def save_message(self, message):
+        uid = uuid.uuid4()
+        created_at = arrow.now("Asia/Seoul")
+        chat_message = {
+            'uid': str(uid),
+            'room_id': str(self.room_id),
+            'message': message,
+            'user_id': str(self.user.id),
+            'username': self.user.username,
+            'created_at': created_at.isoformat()
+        }
+        await self.redis_middleware.cache_message(self.room_id, chat_message)
+
+        MessagePersister.instance().enqueue(
+            uid=uid,
+            user_id=self.user.id,
+            chat_room_id=self.room_id,
+            content=message,
+            created_at=created_at.datetime
+        )
+        return chat_message
 
-    async def get_previous_messages(self):
-        return await self.redis_middleware.get_previous_messages(self.room_id)
+    async def get_previous_messages(self, cursor=None, count=50):
+        return await self.redis_middleware.get_previous_messages(self.room_id, cursor=cursor, count=count)
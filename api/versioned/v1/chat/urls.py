@@ -1,12 +1,14 @@
 from django.urls import path
 from common.routers import CustomSimpleRouter
-from .views import ChatRoomViewSet, ChatRoomParticipantViewSet
+from .views import ChatRoomViewSet, ChatRoomParticipantViewSet, MessageViewSet
 
 router = CustomSimpleRouter(trailing_slash=False)
 router.register(r'', ChatRoomViewSet)
 
 urlpatterns = [
     path("<chat_room>/users", ChatRoomParticipantViewSet.as_view({'get': 'get_participants'})),
+    path("<chat_room>/messages", MessageViewSet.as_view({'get': 'get_messages'})),
+    path("<chat_room>/search", MessageViewSet.as_view({'get': 'search_messages'})),
 ]
 
 urlpatterns += router.urls
\ No newline at end of file
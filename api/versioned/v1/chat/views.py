@@ -2,10 +2,15 @@ from rest_framework import viewsets, permissions
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant, Message
+from api.bases.chat.search import search_messages
 from api.bases.user.models import User
-from api.versioned.v1.chat.serializers import ChatRoomSerializer, ChatRoomParticipantSerializer
+from api.versioned.v1.chat.serializers import (
+    ChatRoomSerializer, ChatRoomParticipantSerializer, MessageSearchSerializer, MessageSerializer
+)
 from api.versioned.v1.user.serializers import UserSerializer
+from common.pagination import KeysetCursor, LimitQueryParamMixin
+from common.presence import RoomPresence
 from common.viewsets import MappingViewSetMixin
 
 
@@ -28,6 +33,31 @@ class ChatRoomViewSet(MappingViewSetMixin,
     permission_classes = [AllowAny, ]
     queryset = ChatRoom.objects.all()
     serializer_class = ChatRoomSerializer
+    # 방 생성/수정/삭제, 메시지 요약 갱신, 접속자 변경 시 버전이 올라갑니다.
+    etag_action_map = {
+        'list': ['chat:rooms'],
+        'retrieve': ['chat:room:{pk}'],
+    }
+    member_counts = None
+
+    def get_etag_variants(self, request):
+        # 응답에 내려줄 접속자 수를 미리 조회해 ETag 에도 그대로 반영합니다.
+        if self.action == 'retrieve':
+            self.member_counts = RoomPresence().get_member_counts([self.kwargs['pk']])
+        else:
+            self.member_counts = RoomPresence().get_all_member_counts()
+        return [sorted(self.member_counts.items())]
+
+    def get_serializer(self, *args, **kwargs):
+        # 목록 / 상세 모두 채팅방별 접속자 수를 Redis 조회 한 번으로 함께 내려줍니다.
+        rooms = args[0] if args else kwargs.get('instance')
+        if rooms is not None:
+            member_counts = self.member_counts
+            if member_counts is None:
+                room_ids = [room.id for room in rooms] if kwargs.get('many') else [rooms.id]
+                member_counts = RoomPresence().get_member_counts(room_ids)
+            kwargs['context'] = {**self.get_serializer_context(), 'member_counts': member_counts}
+        return super().get_serializer(*args, **kwargs)
 
 
 
@@ -38,14 +68,68 @@ class ChatRoomParticipantViewSet(MappingViewSetMixin,
     permission_classes = [AllowAny, ]
     queryset = ChatRoomParticipant.objects.all()
     serializer_class = ChatRoomParticipantSerializer
+    # 접속자 입장/퇴장과 사용자 정보(last_active 포함) 변경 시 버전이 올라갑니다.
+    etag_action_map = {
+        'get_participants': ['chat:room:{chat_room}:users', 'users'],
+    }
+    user_ids = None
 
     def filter_queryset(self, queryset):
         queryset = queryset.filter(**self.kwargs)
         queryset = super().filter_queryset(queryset=queryset)
         return queryset
 
+    def get_etag_variants(self, request):
+        # 접속자 목록은 heartbeat 만료 기준 시각에 따라 버전 변경 없이도 바뀌므로, 응답과 같은 접속자로 ETag 를 만듭니다.
+        self.user_ids = RoomPresence().get_user_ids(self.kwargs['chat_room'])
+        return [','.join(sorted(self.user_ids))]
+
     def get_participants(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        users = User.objects.filter(id__in=queryset.values_list('user_id', flat=True))
+        user_ids = self.user_ids
+        if user_ids is None:
+            user_ids = RoomPresence().get_user_ids(kwargs['chat_room'])
+        users = User.objects.filter(id__in=user_ids)
         serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class MessageViewSet(MappingViewSetMixin,
+                     LimitQueryParamMixin,
+                     viewsets.GenericViewSet):
+    """
+    get_messages: 채팅방 메시지 히스토리 조회
+    search_messages: 채팅방 메시지 검색 (q 파라미터)
+
+    get_messages 는 최신 메시지부터 역순으로, search_messages 는 관련도순으로 조회하며,
+    응답의 next_cursor 를 cursor 파라미터로 넘기면 다음 페이지를 조회합니다.
+    search_messages 의 관련도순은 최근 매칭 메시지 CHAT_SEARCH_MAX_CANDIDATES 건 구간 안에서의 순서이며,
+    한 구간을 모두 넘기면 그 이전 구간의 결과가 이어집니다.
+    """
+    permission_classes = [AllowAny, ]
+    queryset = Message.objects.all()
+    serializer_class = MessageSerializer
+    serializer_action_map = {
+        'search_messages': MessageSearchSerializer,
+    }
+
+    def get_messages(self, request, *args, **kwargs):
+        cursor = request.query_params.get('cursor')
+        before = KeysetCursor.decode(cursor) if cursor else None
+        page_size = self.get_page_size(request)
+
+        messages = Message.get_previous_messages(kwargs['chat_room'], before=before, limit=page_size + 1)
+        next_cursor = None
+        if len(messages) > page_size:
+            messages = messages[:page_size]
+            next_cursor = KeysetCursor.encode(messages[-1]['created_at'], messages[-1]['id'])
+
+        serializer = self.get_serializer(messages, many=True)
+        return Response({'next_cursor': next_cursor, 'results': serializer.data})
+
+    def search_messages(self, request, *args, **kwargs):
+        messages, next_cursor = search_messages(
+            kwargs['chat_room'], request.query_params.get('q', '').strip(),
+            cursor=request.query_params.get('cursor'), limit=self.get_page_size(request)
+        )
+        serializer = self.get_serializer(messages, many=True)
+        return Response({'next_cursor': next_cursor, 'results': serializer.data})
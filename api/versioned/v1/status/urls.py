@@ -2,5 +2,6 @@ from django.urls import path
 from .views import StatusViewSet
 
 urlpatterns = [
-    path('', StatusViewSet.as_view({'get': 'status'}))
+    path('', StatusViewSet.as_view({'get': 'status'})),
+    path('metrics', StatusViewSet.as_view({'get': 'metrics'})),
 ]
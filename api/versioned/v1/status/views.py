@@ -1,18 +1,29 @@
+from django.http import HttpResponse
 from rest_framework import viewsets
 from rest_framework.serializers import Serializer
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework.status import HTTP_200_OK
 
+# 메트릭은 import 시점에 REGISTRY 에 등록되므로 미리 로드합니다.
+from api.versioned.v1.chat import metrics as chat_metrics  # noqa: F401
+from common import middleware as cache_middleware  # noqa: F401
+from common.metrics import REGISTRY
+
 
 class StatusViewSet(viewsets.ReadOnlyModelViewSet):
     """
     status: 상태 체크
+    metrics: 메트릭 조회
 
-    Kibana Heartbeat 상태 체크용 API 입니다.
+    Kibana Heartbeat 상태 체크용 API 와, 워커별 메트릭을 Prometheus text format 으로 반환하는 API 입니다.
     """
     permission_classes = [AllowAny, ]
     serializer_class = Serializer
 
     def status(self, request, *args, **kwargs):
-        return Response(status=HTTP_200_OK)
\ No newline at end of file
+        return Response(status=HTTP_200_OK)
+
+    def metrics(self, request, *args, **kwargs):
+        # DRF renderer 를 거치지 않고 text exposition format 그대로 반환합니다.
+        return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,3 +1,6 @@
+import uuid
+
+from django.conf import settings
 from django.db.models import Max
 from rest_framework import viewsets, permissions, status, mixins
 from rest_framework.permissions import AllowAny
@@ -6,6 +9,9 @@ from rest_framework.response import Response
 from api.bases.chat.models import ChatRoomParticipant
 from api.bases.user.models import User
 from api.versioned.v1.user.serializers import UserSerializer
+from common.caches import get_or_compute_shared
+from common.exceptions import InvalidCursor
+from common.pagination import KeysetCursor, LimitQueryParamMixin
 from common.viewsets import MappingViewSetMixin
 
 import arrow
@@ -32,12 +38,40 @@ class UserViewSet(MappingViewSetMixin,
     serializer_class = UserSerializer
 
 
-class ActiveUsersView(MappingViewSetMixin, viewsets.GenericViewSet):
+class ActiveUsersView(MappingViewSetMixin, LimitQueryParamMixin, viewsets.GenericViewSet):
+    """
+    get_user_active: 최근 30분 안에 활동한 사용자 조회
+
+    최근 활동순으로 조회하며, 응답의 next_cursor 를 cursor 파라미터로 넘기면 다음 페이지를 조회합니다.
+    같은 페이지 응답은 ACTIVE_USERS_CACHE_TTL 동안 모든 워커가 공유합니다.
+    """
     permission_classes = [AllowAny]
     serializer_class = UserSerializer
+    cache_key_format = 'user:active:{position}:{pk}:{limit}'
 
     def get_user_active(self, request, *args, **kwargs):
+        cursor = request.query_params.get('cursor')
+        before = KeysetCursor.decode(cursor, pk_type=uuid.UUID) if cursor else None
+        if before and before[1] is None:
+            # 이 목록의 cursor 는 항상 (last_active, id) 를 담습니다.
+            raise InvalidCursor
+        page_size = self.get_page_size(request)
+
+        # 같은 위치를 가리키는 cursor 는 표기(padding 등)가 달라도 같은 키를 쓰도록 디코딩한 값으로 만듭니다.
+        position, pk = (before[0].isoformat(), before[1]) if before else ('', '')
+        cache_key = self.cache_key_format.format(position=position, pk=pk, limit=page_size)
+        data = get_or_compute_shared(
+            cache_key, settings.ACTIVE_USERS_CACHE_TTL, lambda: self.get_page(before, page_size)
+        )
+        return Response(data)
+
+    def get_page(self, before, page_size):
         thirty_minutes_ago = arrow.now("Asia/Seoul").shift(minutes=-30).datetime
-        active_users = User.objects.filter(last_active__gte=thirty_minutes_ago).order_by('-last_active')
+        active_users = User.get_active_users(thirty_minutes_ago, before=before, limit=page_size + 1)
+        next_cursor = None
+        if len(active_users) > page_size:
+            active_users = active_users[:page_size]
+            next_cursor = KeysetCursor.encode(active_users[-1].last_active, active_users[-1].id)
+
         serializer = self.get_serializer(active_users, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return {'next_cursor': next_cursor, 'results': serializer.data}
\ No newline at end of file
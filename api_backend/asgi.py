@@ -10,11 +10,11 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/wsgi/
 import os
 import django
 
-from common.middleware import RedisCacheASGIMiddleware
-
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_backend.settings')
 django.setup()
 
+from common.middleware import RedisCacheASGIMiddleware
+
 from channels.security.websocket import AllowedHostsOriginValidator
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
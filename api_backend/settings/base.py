@@ -49,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'common.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_backend.urls'
@@ -81,11 +82,20 @@ WSGI_APPLICATION = 'api_backend.wsgi.application'
 
 ASGI_APPLICATION = 'api_backend.asgi.application'
 
+# 채널 레이어 백엔드. 노드를 여러 개 지정하면 채팅방 그룹을 consistent hash 로 나눠 배치합니다.
+# sharded: Redis list 기반(channels_redis 기본 방식) / pubsub: Redis pub/sub 기반(인원이 많은 방에 적합)
+CHANNEL_LAYER_BACKENDS = {
+    'sharded': 'common.channel_layers.ShardedRedisChannelLayer',
+    'pubsub': 'common.channel_layers.ShardedRedisPubSubChannelLayer',
+}
+# 쉼표로 구분한 host:port 목록
+CHANNEL_LAYER_NODES = os.environ.get('CHANNEL_LAYER_NODES', 'localhost:6379').split(',')
+
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'BACKEND': CHANNEL_LAYER_BACKENDS[os.environ.get('CHANNEL_LAYER_TYPE', 'sharded')],
         'CONFIG': {
-            "hosts": [f"redis://:{os.environ.get('REDIS_PASSWORD', 'changeme')}@localhost:6379"],
+            "hosts": [f"redis://:{os.environ.get('REDIS_PASSWORD', 'changeme')}@{node}" for node in CHANNEL_LAYER_NODES],
         },
     },
 }
@@ -98,12 +108,69 @@ CACHES = {
         "LOCATION": f"redis://:{os.environ.get('REDIS_PASSWORD', 'changeme')}@localhost:6379/0",
         "TIMEOUT": 3600,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient"
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REDIS_CLIENT_CLASS": "common.profiling.ProfiledRedis"
         }
     }
 }
 
 CACHE_TIMEOUT = 3000
+
+# 채팅방별 Redis 링 버퍼에 보관할 최근 메시지 수와 유휴 만료 시간(초)
+CHAT_HISTORY_MAX_LENGTH = 100
+CHAT_HISTORY_TTL = 60 * 60 * 24
+
+# 접속 상태(presence) heartbeat 주기와, heartbeat 가 끊긴 연결을 만료 처리하는 시간(초)
+CHAT_PRESENCE_HEARTBEAT_INTERVAL = 30
+CHAT_PRESENCE_TIMEOUT = 90
+# 접속자가 이 수 이상인 방은 입장/퇴장 이벤트를 window(초) 동안 모아 presence_delta 로 전송
+CHAT_PRESENCE_COALESCE_MIN_USERS = 50
+CHAT_PRESENCE_COALESCE_WINDOW = 1.0
+
+# 접속 시 User / ChatRoom 조회용 프로세스 로컬 캐시 (최대 건수 / TTL(초))
+LOCAL_RECORD_CACHE_MAX_SIZE = 10000
+LOCAL_RECORD_CACHE_TTL = 60 * 5
+
+# 사용자 last_active 를 모아서 저장하는 주기(초)
+USER_ACTIVITY_FLUSH_INTERVAL = 60
+# 활동 중인 사용자 목록 응답을 워커 간에 공유하는 시간(초)
+ACTIVE_USERS_CACHE_TTL = 5
+
+# 채팅 메시지 write-behind 저장 설정 (건수 / 주기(초) / 저장 실패 시 최대 보관 건수)
+CHAT_PERSIST_BATCH_SIZE = 100
+CHAT_PERSIST_FLUSH_INTERVAL = 1.0
+CHAT_PERSIST_MAX_PENDING = 10000
+
+# 채팅 메시지 전송 속도 제한 (초당 충전 토큰 수 / 최대 토큰 수), 연결별 / 사용자별 버킷을 모두 통과해야 전송
+CHAT_RATE_LIMIT_CONNECTION_RATE = 5
+CHAT_RATE_LIMIT_CONNECTION_BURST = 10
+CHAT_RATE_LIMIT_USER_RATE = 10
+CHAT_RATE_LIMIT_USER_BURST = 20
+
+# 연결별 송신 큐 크기와 가득 찼을 때의 정책 (drop_oldest / coalesce_presence / disconnect)
+CHAT_OUTBOUND_QUEUE_SIZE = 256
+CHAT_OUTBOUND_OVERFLOW_POLICY = 'coalesce_presence'
+
+# 채팅 메시지 검색: 한 번에 순위를 매길 매칭 메시지 구간 크기 / 검색어 최대 길이
+CHAT_SEARCH_MAX_CANDIDATES = 1000
+CHAT_SEARCH_MAX_QUERY_LENGTH = 100
+
+# 보관 기간(일)이 지난 메시지를 옮길 세그먼트 파일 경로 / 압축 블록당 메시지 수 (archive_messages 명령)
+CHAT_ARCHIVE_ROOT = os.getenv('CHAT_ARCHIVE_ROOT', os.path.join(BASE_DIR, '../archive'))
+CHAT_ARCHIVE_RETENTION_DAYS = 90
+CHAT_ARCHIVE_BLOCK_SIZE = 256
+
+# 보관 기간(초)이 지난 채팅방 참여 정보 / 유휴 캐시 정리 (sweep_chat_retention 명령)
+# CHAT_SWEEP_INTERVAL(초)을 지정하면 consumer 가 실행 중인 워커에서 주기적으로 실행합니다. (0 이면 비활성화)
+CHAT_PARTICIPANT_RETENTION = 60 * 60 * 24
+CHAT_SWEEP_INTERVAL = int(os.getenv('CHAT_SWEEP_INTERVAL', 0))
+CHAT_SWEEP_BATCH_SIZE = 500
+
+# 요청별 Server-Timing 헤더 / 느린 요청 로그 (기본 비활성화)
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'false').lower() == 'true'
+SERVER_TIMING_SLOW_REQUEST_MS = 500
+SERVER_TIMING_SLOW_QUERY_COUNT = 5
+
 TIME_ZONE = 'Asia/Seoul'
 
 # Database
@@ -186,9 +253,12 @@ SWAGGER_SETTINGS = {
     'REFETCH_SCHEMA_ON_LOGOUT': True
 }
 
+# JSON 인코딩 구현 (json / orjson), 웹소켓 프레임과 DRF 응답에 함께 적용
+JSON_CODEC = 'orjson'
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'common.renderers.CodecJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': [],
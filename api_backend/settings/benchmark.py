@@ -0,0 +1,42 @@
+import tempfile
+
+from .base import *
+
+# 벤치마크 전용 설정
+# RUNNING_ENV=benchmark python manage.py bench_chat_ws
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BENCHMARK_DB_PATH', os.path.join(tempfile.gettempdir(), 'jasoseol_benchmark.sqlite3')),
+    }
+}
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'CONFIG': {
+            'capacity': 10000,
+        },
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://:{os.getenv('REDIS_PASSWORD', 'changeme')}@{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/0",
+        "TIMEOUT": 3600,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REDIS_CLIENT_CLASS": "common.profiling.ProfiledRedis"
+        }
+    }
+}
+
+# 전송 속도 자체를 측정하므로 채팅 속도 제한은 사실상 해제합니다.
+CHAT_RATE_LIMIT_CONNECTION_RATE = 100000
+CHAT_RATE_LIMIT_CONNECTION_BURST = 100000
+CHAT_RATE_LIMIT_USER_RATE = 100000
+CHAT_RATE_LIMIT_USER_BURST = 100000
+
+DEBUG = False
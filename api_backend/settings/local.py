@@ -2,11 +2,13 @@ from .base import *
 
 # Define local settings
 
+CHANNEL_LAYER_NODES = os.getenv('CHANNEL_LAYER_NODES', f"{os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', 6379)}").split(',')
+
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'BACKEND': CHANNEL_LAYER_BACKENDS[os.getenv('CHANNEL_LAYER_TYPE', 'sharded')],
         'CONFIG': {
-            "hosts": [f"redis://:{os.getenv('REDIS_PASSWORD', 'changeme')}@{os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', 6379)}"],
+            "hosts": [f"redis://:{os.getenv('REDIS_PASSWORD', 'changeme')}@{node}" for node in CHANNEL_LAYER_NODES],
         },
     },
 }
@@ -17,7 +19,8 @@ CACHES = {
         "LOCATION": f"redis://:{os.getenv('REDIS_PASSWORD', 'changeme')}@{os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', 6379)}/0",
         "TIMEOUT": 3600,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient"
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REDIS_CLIENT_CLASS": "common.profiling.ProfiledRedis"
         }
     }
 }
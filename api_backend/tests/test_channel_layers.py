@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.channel_layers import HashRing, ShardedRedisChannelLayer, ShardedRedisPubSubChannelLayer
+
+HOSTS = [f'redis://redis-{index}:6379' for index in range(3)]
+GROUPS = [f'chat_room_{room_id}' for room_id in range(2000)]
+
+
+class HashRingTests(SimpleTestCase):
+    def test_groups_are_spread_across_nodes(self):
+        ring = HashRing(HOSTS)
+
+        counts = [0] * len(HOSTS)
+        for group in GROUPS:
+            counts[ring.get_index(group)] += 1
+
+        for count in counts:
+            self.assertGreater(count, len(GROUPS) / len(HOSTS) * 0.7)
+
+    def test_adding_node_moves_only_its_share(self):
+        ring = HashRing(HOSTS)
+        grown = HashRing(HOSTS + ['redis://redis-3:6379'])
+
+        moved = [group for group in GROUPS if ring.get_index(group) != grown.get_index(group)]
+
+        # 새 노드로 옮겨진 방만 배치가 바뀝니다.
+        self.assertTrue(all(grown.get_index(group) == 3 for group in moved))
+        self.assertLess(len(moved), len(GROUPS) * 0.35)
+
+    def test_mapping_is_stable_across_instances(self):
+        self.assertEqual(
+            [HashRing(HOSTS).get_index(group) for group in GROUPS[:50]],
+            [HashRing(list(HOSTS)).get_index(group) for group in GROUPS[:50]]
+        )
+
+
+class ShardedRedisChannelLayerTests(SimpleTestCase):
+    async def test_group_operations_use_ring_shard(self):
+        layer = ShardedRedisChannelLayer(hosts=HOSTS)
+
+        with mock.patch.object(layer, 'connection', return_value=mock.AsyncMock()) as get_connection:
+            await layer.group_add('chat_room_1', 'specific.channel!abc')
+
+        get_connection.assert_called_once_with(layer.hash_ring.get_index('chat_room_1'))
+
+    async def test_pubsub_layer_uses_ring_shard(self):
+        loop_layer = ShardedRedisPubSubChannelLayer(hosts=HOSTS)._get_layer()
+
+        shard = loop_layer._get_shard('chat_room_1')
+
+        self.assertIs(shard, loop_layer._shards[HashRing(HOSTS).get_index('chat_room_1')])
@@ -1,10 +1,15 @@
+import uuid
+
 import arrow
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from api.bases.chat.models import ChatRoom, Message, ChatRoomParticipant
+from api.bases.chat.persistence import MessagePersister
 from api.bases.user.models import User
 from api.versioned.v1.chat.serializers import ChatRoomSerializer
+from common.pagination import encode_cursor
+from common.presence import RoomPresence
 
 
 class ChatViewSetTests(APITestCase):
@@ -50,13 +55,16 @@ class ChatViewSetTests(APITestCase):
     def test_chatroom_update(self):
         url = f'{self.base_url}/{self.chat_room.pk}'
         data = {
-            "title": "Updated Room"
+            "title": "Updated Room",
+            "archived_until": "2026-01-01T00:00:00Z"
         }
         response = self.client.put(url, data, format='json')
 
         self.chat_room.refresh_from_db()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(self.chat_room.title, data['title'])
+        # archive 기준 시각은 archive_messages 명령만 갱신합니다.
+        self.assertIsNone(self.chat_room.archived_until)
 
     def test_chatroom_delete(self):
         url = f'{self.base_url}/{self.chat_room.pk}'
@@ -69,3 +77,112 @@ class ChatViewSetTests(APITestCase):
     def test_unique_participant_constraint(self):
         with self.assertRaises(Exception):
             ChatRoomParticipant.objects.create(user=self.user1, chat_room=self.chat_room)
+
+
+class MessageHistoryApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        same_time = arrow.now("Asia/Seoul").datetime
+        # 같은 created_at 을 가진 메시지도 id 로 순서가 정해져야 합니다.
+        self.messages = [
+            Message.objects.create(user=self.user, chat_room=self.chat_room, content=f'message {index}',
+                                   created_at=same_time)
+            for index in range(5)
+        ]
+        self.url = f'/v1/chat/{self.chat_room.pk}/messages'
+
+    def test_pages_do_not_skip_or_repeat_messages(self):
+        contents = []
+        cursor = None
+        while True:
+            params = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            contents += [message['content'] for message in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(contents, [f'message {index}' for index in reversed(range(5))])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        cursor = encode_cursor({'t': arrow.now("Asia/Seoul").isoformat(), 'i': 'not-an-id'})
+        response = self.client.get(self.url, {'cursor': cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username="user1")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.presence = RoomPresence()
+        self.presence.client.delete(*self.presence.get_keys(self.chat_room.pk))
+
+    def tearDown(self):
+        self.presence.client.delete(*self.presence.get_keys(self.chat_room.pk))
+        self.presence.client.hdel(self.presence.members_key, str(self.chat_room.pk))
+
+    def assertNotModified(self, url):
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def test_unchanged_resources_return_304_without_queries(self):
+        for url in ('/v1/chat/', f'/v1/chat/{self.chat_room.pk}', f'/v1/chat/{self.chat_room.pk}/users'):
+            self.assertNotModified(url)
+
+    def test_room_update_changes_etag(self):
+        list_etag = self.assertNotModified('/v1/chat/')
+        detail_etag = self.assertNotModified(f'/v1/chat/{self.chat_room.pk}')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f'/v1/chat/{self.chat_room.pk}', {'title': 'Updated Room'}, format='json')
+
+        response = self.client.get('/v1/chat/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(f'/v1/chat/{self.chat_room.pk}', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Updated Room')
+
+    def test_presence_and_messages_change_etag(self):
+        users_url = f'/v1/chat/{self.chat_room.pk}/users'
+        users_etag = self.assertNotModified(users_url)
+        self.presence.join(self.chat_room.pk, self.user.id)
+        self.assertEqual(self.client.get(users_url, HTTP_IF_NONE_MATCH=users_etag).status_code, status.HTTP_200_OK)
+
+        # 같은 사용자의 두 번째 연결은 접속자 구성이 바뀌지 않으므로 버전도 그대로입니다.
+        users_etag = self.assertNotModified(users_url)
+        self.presence.join(self.chat_room.pk, self.user.id)
+        self.assertEqual(self.client.get(users_url)['ETag'], users_etag)
+
+        # heartbeat 가 끊긴 연결은 sweep 전이라도 접속자 목록과 ETag 에서 빠집니다.
+        users_etag = self.assertNotModified(users_url)
+        self.presence.client.zadd(self.presence.get_keys(self.chat_room.pk)[0],
+                                  {str(self.user.id): self.presence.get_cutoff() - 1})
+        response = self.client.get(users_url, HTTP_IF_NONE_MATCH=users_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+        list_etag = self.assertNotModified('/v1/chat/')
+        persister = MessagePersister(batch_size=10, flush_interval=60)
+        persister.enqueue(uid=uuid.uuid4(), user_id=self.user.id, chat_room_id=self.chat_room.id,
+                          content='hello', created_at=arrow.now("Asia/Seoul").datetime)
+        with self.captureOnCommitCallbacks(execute=True):
+            persister.flush_sync()
+
+        response = self.client.get('/v1/chat/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['last_message_preview'], 'hello')
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import arrow
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.bases.chat.archive import MessageArchive
+from api.bases.chat.models import ChatRoom, Message
+from api.bases.user.models import User
+
+
+class MessageArchiveTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.override = override_settings(CHAT_ARCHIVE_ROOT=self.root, CHAT_ARCHIVE_BLOCK_SIZE=2)
+        self.override.enable()
+
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        old = arrow.utcnow().shift(days=-100).replace(hour=23, minute=59, second=50)
+        # 이틀에 걸친 오래된 메시지 5건 (같은 시각 포함) + 최근 메시지 2건
+        created_at = [old.shift(seconds=index * 4) for index in range(4)] + [old.shift(seconds=12)]
+        created_at += [arrow.utcnow().shift(minutes=-index) for index in (2, 1)]
+        for index, value in enumerate(created_at):
+            Message.objects.create(user=self.user, chat_room=self.chat_room, content=f'message {index}',
+                                   created_at=value.datetime)
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.root)
+
+    def _archive(self):
+        call_command('archive_messages', days=90, batch_size=3, stdout=open(os.devnull, 'w'))
+
+    def _scroll_back(self, limit):
+        contents, before = [], None
+        while True:
+            messages = Message.get_previous_messages(self.chat_room.id, before=before, limit=limit)
+            contents += [message['content'] for message in messages]
+            if len(messages) < limit:
+                return contents
+            before = (messages[-1]['created_at'], messages[-1]['id'])
+
+    def test_moves_old_messages_into_day_segments(self):
+        self._archive()
+
+        self.assertEqual(list(Message.objects.values_list('content', flat=True).order_by('id')),
+                         ['message 5', 'message 6'])
+        self.assertEqual(len(MessageArchive().get_days(self.chat_room.id)), 2)
+
+    def test_history_continues_into_archive(self):
+        expected = self._scroll_back(limit=3)
+        self._archive()
+
+        self.assertEqual(self._scroll_back(limit=3), expected)
+        self.assertEqual(self._scroll_back(limit=2), expected)
+        self.assertEqual(expected, [f'message {index}' for index in (6, 5, 4, 3, 2, 1, 0)])
+
+    def test_archive_is_read_only_for_archived_rooms(self):
+        with mock.patch.object(MessageArchive, 'get_previous_messages', return_value=[]) as read_archive:
+            Message.get_previous_messages(self.chat_room.id, limit=10)
+            read_archive.assert_not_called()
+
+            self._archive()
+            Message.get_previous_messages(self.chat_room.id, limit=10)
+            read_archive.assert_called_once()
+
+        self.chat_room.refresh_from_db()
+        newest_archived = MessageArchive().get_previous_messages(self.chat_room.id, limit=1)[0]
+        self.assertEqual(self.chat_room.archived_until, newest_archived['created_at'])
+
+    def test_rewritten_and_truncated_segments_are_read_once(self):
+        archive = MessageArchive()
+        messages = Message.get_previous_messages(self.chat_room.id, limit=10)[2:]
+        archive.append(self.chat_room.id, messages)
+        # 삭제 전에 중단되어 같은 메시지를 다시 기록하고, 인덱스 기록 중에 중단된 경우
+        archive.append(self.chat_room.id, messages)
+        for day in archive.get_days(self.chat_room.id):
+            with open(archive.get_paths(self.chat_room.id, day)[1], 'ab') as index:
+                index.write(b'\x00' * 10)
+
+        archived = archive.get_previous_messages(self.chat_room.id, limit=10)
+
+        self.assertEqual([message['content'] for message in archived],
+                         [f'message {index}' for index in (4, 3, 2, 1, 0)])
+        self.assertEqual(archived[0]['uid'], messages[0]['uid'])
+        self.assertEqual(archived[0]['created_at'], messages[0]['created_at'])
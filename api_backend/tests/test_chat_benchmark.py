@@ -0,0 +1,42 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase
+
+from api.bases.chat.management.commands.bench_api import ApiBenchmark, find_violations
+from api.bases.chat.management.commands.bench_chat_ws import ChatWebsocketBenchmark
+from api.bases.chat.models import ChatRoom
+from api.bases.user.models import User
+
+
+class ChatWebsocketBenchmarkTests(TransactionTestCase):
+    def test_small_room_delivers_every_message(self):
+        benchmark = ChatWebsocketBenchmark(room_size=3, senders=2, rate=500, messages=4, timeout=5)
+
+        result = async_to_sync(benchmark.run)()
+
+        self.assertEqual(result['delivered'], result['expected_deliveries'])
+        self.assertIsNotNone(result['latency_ms']['p99'])
+        self.assertGreater(result['queries_per_message'], 0)
+        self.assertEqual(ChatRoom.objects.count(), 0)
+
+
+class ApiBenchmarkTests(TestCase):
+    def test_endpoints_stay_within_query_budget(self):
+        result = ApiBenchmark(users=20, rooms=2, participants=5, messages=10, repeat=2).run()
+
+        self.assertEqual(find_violations(result), [])
+        self.assertEqual({endpoint['name'] for endpoint in result['endpoints']},
+                         {'chat_rooms', 'chat_room_participants', 'chat_room_messages', 'users', 'active_users'})
+        self.assertEqual(ChatRoom.objects.count(), 0)
+        self.assertEqual(User.objects.count(), 0)
+
+    def test_budget_and_latency_violations_are_reported(self):
+        result = {
+            'users': 10,
+            'endpoints': [{'name': 'users', 'status': 200, 'queries': 11, 'query_budget': 1,
+                           'latency_ms': {'p50': 1.0, 'p99': 900.0, 'max': 900.0}}]
+        }
+
+        violations = find_violations(result, max_p99_ms=100)
+
+        self.assertEqual(len(violations), 2)
+        self.assertIn('11 queries > budget 1', violations[0])
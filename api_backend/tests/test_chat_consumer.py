@@ -0,0 +1,132 @@
+from unittest import mock
+
+import msgpack
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from api.bases.chat.persistence import MessagePersister
+from api.bases.user.models import User
+from api.versioned.v1.chat.consumer import ChatConsumer
+from api_backend.asgi import application
+from common.presence import RoomPresence
+
+
+class ChatConsumerHistoryTests(SimpleTestCase):
+    messages = [{'uid': '1', 'message': 'hello'}, {'uid': '2', 'message': 'world'}]
+
+    def _consumer(self, query_string=b'', subprotocols=None):
+        consumer = ChatConsumer()
+        consumer.scope = {'query_string': query_string, 'subprotocols': subprotocols or []}
+        consumer.send_json = mock.AsyncMock()
+        return consumer
+
+    async def test_history_batch_by_query_param(self):
+        consumer = self._consumer(query_string=b'history=batch')
+
+        await consumer.send_history(self.messages, 'cursor')
+
+        consumer.send_json.assert_awaited_once_with({
+            'type': 'history',
+            'messages': self.messages,
+            'next_cursor': 'cursor'
+        })
+
+    async def test_history_batch_by_subprotocol(self):
+        consumer = self._consumer(subprotocols=[ChatConsumer.history_subprotocol])
+
+        await consumer.send_history(self.messages, None)
+
+        self.assertEqual(consumer.get_subprotocol(), ChatConsumer.history_subprotocol)
+        self.assertEqual(consumer.send_json.await_count, 1)
+
+    async def test_per_message_fallback(self):
+        consumer = self._consumer()
+
+        await consumer.send_history(self.messages, 'cursor')
+
+        self.assertIsNone(consumer.get_subprotocol())
+        consumer.send_json.assert_has_awaits([mock.call(message) for message in self.messages])
+
+
+class ChatConsumerConnectTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.presence = RoomPresence()
+        self.path = f'/ws/room/{self.chat_room.id}/messages/{self.user.id}'
+
+    def tearDown(self):
+        self.presence.client.delete(*self.presence.get_keys(self.chat_room.id))
+
+    async def _connect(self):
+        communicator = WebsocketCommunicator(application, self.path)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        join = await communicator.receive_json_from()
+        await communicator.disconnect()
+        return join
+
+    async def test_connect_registers_membership_and_presence(self):
+        join = await self._connect()
+
+        self.assertEqual(join['type'], 'user_join')
+        self.assertEqual(join['connected_users_count'], 1)
+        self.assertTrue(await database_sync_to_async(
+            ChatRoomParticipant.objects.filter(user=self.user, chat_room=self.chat_room).exists)())
+
+    def test_reconnect_resolves_identity_from_local_cache(self):
+        async_to_sync(self._connect)()
+
+        with CaptureQueriesContext(connection) as queries:
+            async_to_sync(self._connect)()
+
+        # 재접속 시 사용자/채팅방 조회 없이 참여 정보는 upsert 한 번으로 갱신됩니다.
+        sqls = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([sql for sql in sqls if sql.startswith('SELECT') and 'FROM "user_user"' in sql])
+        self.assertFalse([sql for sql in sqls if 'FROM "chat_chatroom"' in sql])
+        self.assertEqual(len([sql for sql in sqls if 'chat_chatroomparticipant' in sql]), 1)
+
+    async def test_msgpack_subprotocol_exchanges_binary_frames(self):
+        communicator = WebsocketCommunicator(application, self.path, subprotocols=['msgpack'])
+        connected, subprotocol = await communicator.connect()
+        self.assertEqual(subprotocol, 'msgpack')
+
+        join = msgpack.unpackb((await communicator.receive_output())['bytes'])
+        self.assertEqual(join['type'], 'user_join')
+
+        await communicator.send_to(bytes_data=msgpack.packb({'message': 'hello'}))
+        frame = msgpack.unpackb((await communicator.receive_output())['bytes'])
+        await communicator.disconnect()
+        await MessagePersister.instance().flush()
+
+        self.assertEqual(frame['message'], 'hello')
+        self.assertEqual(frame['username'], 'user1')
+
+
+class ChatConsumerEncodingTests(SimpleTestCase):
+    event = {
+        'type': 'chat_message', 'uid': '1', 'message': 'hi', 'user_id': 'u', 'username': 'user',
+        'created_at': 'now', 'frames': {'json': '{"prepared": true}', 'msgpack': b'prepared'}
+    }
+
+    async def test_chat_message_forwards_prepared_frame(self):
+        consumer = ChatConsumer()
+        consumer.outbound = mock.Mock()
+
+        await consumer.chat_message(self.event)
+
+        consumer.outbound.put.assert_called_once_with('{"prepared": true}')
+
+    async def test_send_frame_uses_binary_for_bytes(self):
+        consumer = ChatConsumer()
+        consumer.send = mock.AsyncMock()
+
+        await consumer.send_frame(b'prepared')
+
+        consumer.send.assert_awaited_once_with(bytes_data=b'prepared', close=False)
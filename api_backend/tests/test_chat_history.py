@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.history import RoomMessageHistory
+
+
+class RoomMessageHistoryTests(SimpleTestCase):
+    def setUp(self):
+        self.history = RoomMessageHistory(max_length=3, ttl=60)
+        self.room_id = 'test-history-room'
+        self.history.clear(self.room_id)
+
+    def tearDown(self):
+        self.history.clear(self.room_id)
+
+    def test_append_keeps_only_latest_messages(self):
+        for index in range(5):
+            self.history.append(self.room_id, {'message': f'message {index}'})
+
+        messages = self.history.range(self.room_id, count=10)
+
+        self.assertEqual(self.history.length(self.room_id), 3)
+        self.assertEqual([m['message'] for m in messages], ['message 2', 'message 3', 'message 4'])
+
+    def test_range_returns_newest_tail_in_order(self):
+        for index in range(3):
+            self.history.append(self.room_id, {'message': f'message {index}'})
+
+        messages = self.history.range(self.room_id, count=2)
+
+        self.assertEqual([m['message'] for m in messages], ['message 1', 'message 2'])
+
+    def test_append_sets_idle_ttl(self):
+        self.history.append(self.room_id, {'message': 'hello'})
+
+        ttl = self.history.client.ttl(self.history.get_key(self.room_id))
+
+        self.assertTrue(0 < ttl <= 60)
+
+    def test_script_is_registered_once(self):
+        self.history.append(self.room_id, {'message': 'first'})
+
+        with mock.patch.object(type(self.history.client), 'register_script') as register_script:
+            self.history.append(self.room_id, {'message': 'second'})
+
+        register_script.assert_not_called()
+        self.assertEqual(self.history.length(self.room_id), 2)
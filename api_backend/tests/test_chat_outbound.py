@@ -0,0 +1,95 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.versioned.v1.chat.consumer import ChatConsumer
+from api.versioned.v1.chat.outbound import OutboundQueue
+
+
+class OutboundQueueTests(SimpleTestCase):
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            OutboundQueue(mock.AsyncMock(), 2, policy='unknown')
+
+    def test_drop_oldest(self):
+        queue = OutboundQueue(mock.AsyncMock(), 2, policy=OutboundQueue.DROP_OLDEST)
+
+        for index in range(3):
+            self.assertTrue(queue.put({'message': index}))
+
+        self.assertEqual([frame['message'] for frame in queue._frames], [1, 2])
+
+    def test_coalesce_presence_drops_presence_first(self):
+        queue = OutboundQueue(mock.AsyncMock(), 3, policy=OutboundQueue.COALESCE_PRESENCE)
+        queue.put({'message': 'a'})
+        queue.put({'type': 'user_join', 'connected_users_count': 1})
+        queue.put({'message': 'b'})
+
+        queue.put({'type': 'user_leave', 'connected_users_count': 0})
+
+        self.assertEqual(list(queue._frames), [
+            {'message': 'a'}, {'message': 'b'}, {'type': 'user_leave', 'connected_users_count': 0}
+        ])
+
+    def test_coalesce_presence_never_evicts_chat_for_presence(self):
+        queue = OutboundQueue(mock.AsyncMock(), 2, policy=OutboundQueue.COALESCE_PRESENCE)
+        queue.put({'message': 'a'})
+        queue.put({'message': 'b'})
+
+        self.assertTrue(queue.put({'type': 'user_join', 'connected_users_count': 1}))
+
+        self.assertEqual(list(queue._frames), [{'message': 'a'}, {'message': 'b'}])
+
+    def test_disconnect_policy_rejects_when_full(self):
+        queue = OutboundQueue(mock.AsyncMock(), 1, policy=OutboundQueue.DISCONNECT)
+
+        self.assertTrue(queue.put({'message': 'a'}))
+        self.assertFalse(queue.put({'message': 'b'}))
+        self.assertEqual(len(queue), 1)
+
+    async def test_writer_sends_in_order(self):
+        sent = []
+
+        async def send(frame):
+            await asyncio.sleep(0)
+            sent.append(frame['message'])
+
+        queue = OutboundQueue(send, 10)
+        queue.start()
+        for index in range(3):
+            queue.put({'message': index})
+        await asyncio.sleep(0.01)
+        queue.put({'message': 3})
+        await asyncio.sleep(0.01)
+        queue.close()
+
+        self.assertEqual(sent, [0, 1, 2, 3])
+
+    async def test_send_failure_closes_queue(self):
+        send = mock.AsyncMock(side_effect=[None, Exception('socket closed')])
+        queue = OutboundQueue(send, 10)
+        queue.start()
+        for index in range(3):
+            queue.put({'message': index})
+        await asyncio.sleep(0.01)
+
+        self.assertTrue(queue.closed)
+        self.assertEqual(len(queue), 0)
+        self.assertFalse(queue.put({'message': 3}))
+        self.assertEqual(send.await_count, 2)
+        queue.close()
+
+
+class ChatConsumerOutboundTests(SimpleTestCase):
+    async def test_slow_consumer_is_disconnected(self):
+        consumer = ChatConsumer()
+        consumer.channel_name = 'test-channel'
+        consumer.outbound = OutboundQueue(mock.AsyncMock(), 1, policy=OutboundQueue.DISCONNECT)
+        consumer.close = mock.AsyncMock()
+        event = {'uid': '1', 'message': 'hi', 'user_id': 'u', 'username': 'user', 'created_at': 'now'}
+
+        await consumer.chat_message(event)
+        await consumer.chat_message(event)
+
+        consumer.close.assert_awaited_once_with(code=ChatConsumer.slow_consumer_close_code)
@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+from unittest import mock
+
+import arrow
+from django.test import TestCase
+
+from api.bases.chat.models import ChatRoom, Message
+from api.bases.chat.persistence import MessagePersister
+from api.bases.user.models import User
+
+
+class MessagePersisterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+
+    def _enqueue(self, persister, content):
+        persister.enqueue(
+            uid=uuid.uuid4(),
+            user_id=self.user.id,
+            chat_room_id=self.chat_room.id,
+            content=content,
+            created_at=arrow.now("Asia/Seoul").datetime
+        )
+
+    def test_buffers_until_batch_size(self):
+        persister = MessagePersister(batch_size=3, flush_interval=60)
+        self._enqueue(persister, 'first')
+        self._enqueue(persister, 'second')
+
+        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(persister.get_stats()['pending'], 2)
+
+        self._enqueue(persister, 'third')
+
+        self.assertEqual(Message.objects.count(), 3)
+        self.assertEqual(persister.get_stats(), {'pending': 0, 'flushed': 3, 'dropped': 0})
+
+    def test_flush_keeps_ingest_timestamp(self):
+        persister = MessagePersister(batch_size=10, flush_interval=60)
+        created_at = arrow.now("Asia/Seoul").shift(minutes=-5).datetime
+        persister.enqueue(uid=uuid.uuid4(), user_id=self.user.id, chat_room_id=self.chat_room.id,
+                          content='late', created_at=created_at)
+
+        persister.flush_sync()
+
+        self.assertEqual(Message.objects.get().created_at, created_at)
+
+    def test_failed_flush_requeues_batch(self):
+        persister = MessagePersister(batch_size=10, flush_interval=60, max_pending=2)
+        for content in ('a', 'b', 'c'):
+            self._enqueue(persister, content)
+
+        with mock.patch.object(Message.objects, 'bulk_create', side_effect=Exception('db down')):
+            self.assertEqual(persister.flush_sync(), 0)
+
+        self.assertEqual(persister.get_stats(), {'pending': 2, 'flushed': 0, 'dropped': 1})
+        persister.flush_sync()
+        self.assertEqual(list(Message.objects.order_by('created_at').values_list('content', flat=True)), ['b', 'c'])
+
+    async def test_timer_flushes_pending_messages(self):
+        persister = MessagePersister(batch_size=10, flush_interval=0.01)
+        self._enqueue(persister, 'hello')
+
+        await asyncio.sleep(0.1)
+        persister._timer_task.cancel()
+
+        self.assertEqual(persister.get_stats()['flushed'], 1)
+
+    def test_flush_updates_room_summary(self):
+        persister = MessagePersister(batch_size=10, flush_interval=60)
+        now = arrow.now("Asia/Seoul")
+        for content, minutes in (('newest', 0), ('older', -5)):
+            persister.enqueue(uid=uuid.uuid4(), user_id=self.user.id, chat_room_id=self.chat_room.id,
+                              content=content, created_at=now.shift(minutes=minutes).datetime)
+        persister.flush_sync()
+
+        # 늦게 도착한 이전 메시지는 미리보기를 덮어쓰지 않습니다.
+        self._enqueue(persister, 'x' * 150)
+        ChatRoom.objects.filter(id=self.chat_room.id).update(last_message_at=now.shift(minutes=10).datetime)
+        persister.flush_sync()
+
+        self.chat_room.refresh_from_db()
+        self.assertEqual(self.chat_room.message_count, 3)
+        self.assertEqual(self.chat_room.last_message_preview, 'newest')
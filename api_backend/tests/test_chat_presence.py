@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from api.bases.chat.models import ChatRoom
+from api.bases.user.models import User
+from common.presence import RoomPresence
+
+
+class RoomPresenceTests(SimpleTestCase):
+    def setUp(self):
+        self.presence = RoomPresence(timeout=90)
+        self.room_id = 'test-presence-room'
+        self.presence.client.delete(*self.presence.get_keys(self.room_id))
+
+    def tearDown(self):
+        self.presence.client.delete(*self.presence.get_keys(self.room_id))
+
+    def test_join_and_leave_count_users_not_connections(self):
+        self.assertEqual(self.presence.join(self.room_id, 'user1'), 1)
+        self.assertEqual(self.presence.join(self.room_id, 'user1'), 1)
+        self.assertEqual(self.presence.join(self.room_id, 'user2'), 2)
+
+        self.assertEqual(self.presence.leave(self.room_id, 'user1'), 2)
+        self.assertEqual(self.presence.leave(self.room_id, 'user1'), 1)
+        self.assertEqual(self.presence.get_user_ids(self.room_id), ['user2'])
+
+    def test_sweep_removes_expired_heartbeats(self):
+        with mock.patch('common.presence.time') as mocked_time:
+            mocked_time.time.return_value = 1000
+            self.presence.join(self.room_id, 'stale')
+
+        self.assertEqual(self.presence.count(self.room_id), 0)
+        self.assertEqual(self.presence.sweep(self.room_id), 1)
+        self.assertEqual(self.presence.client.zcard(self.presence.get_keys(self.room_id)[0]), 0)
+
+    def test_join_sweeps_expired_users(self):
+        with mock.patch('common.presence.time') as mocked_time:
+            mocked_time.time.return_value = 1000
+            self.presence.join(self.room_id, 'stale')
+
+        self.assertEqual(self.presence.join(self.room_id, 'alive'), 1)
+
+    def test_heartbeat_revives_swept_user(self):
+        with mock.patch('common.presence.time') as mocked_time:
+            mocked_time.time.return_value = 1000
+            self.presence.join(self.room_id, 'user1')
+        self.presence.sweep(self.room_id)
+
+        self.presence.heartbeat(self.room_id, 'user1')
+
+        self.assertEqual(self.presence.get_user_ids(self.room_id), ['user1'])
+
+
+class ParticipantsApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.presence = RoomPresence()
+        self.user1 = User.objects.create(username="user1")
+        self.user2 = User.objects.create(username="user2")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.presence.join(self.chat_room.id, self.user1.id)
+
+    def tearDown(self):
+        self.presence.client.delete(*self.presence.get_keys(self.chat_room.id))
+
+    def test_participants_are_read_from_presence(self):
+        response = self.client.get(f'/v1/chat/{self.chat_room.pk}/users')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['username'] for user in response.data], ['user1'])
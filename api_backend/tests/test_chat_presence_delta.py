@@ -0,0 +1,40 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.versioned.v1.chat.aggregators import PresenceAggregator
+
+
+class PresenceAggregatorTests(SimpleTestCase):
+    def setUp(self):
+        self.channel_layer = SimpleNamespace(group_send=mock.AsyncMock())
+        self.aggregator = PresenceAggregator(window=0.01, min_users=3, channel_layer=self.channel_layer)
+        self.users = [SimpleNamespace(id=f'user-{index}', username=f'user{index}') for index in range(4)]
+
+    async def test_small_room_sends_immediately(self):
+        await self.aggregator.publish('chat_room_1', 'user_join', self.users[0], 1)
+
+        self.channel_layer.group_send.assert_awaited_once_with('chat_room_1', {
+            'type': 'user_join',
+            'user_id': 'user-0',
+            'username': 'user0',
+            'connected_users_count': 1
+        })
+
+    async def test_large_room_coalesces_into_one_delta(self):
+        await self.aggregator.publish('chat_room_1', 'user_join', self.users[0], 3)
+        await self.aggregator.publish('chat_room_1', 'user_join', self.users[1], 4)
+        await self.aggregator.publish('chat_room_1', 'user_leave', self.users[2], 3)
+        await self.aggregator.publish('chat_room_1', 'user_join', self.users[3], 4)
+        await self.aggregator.publish('chat_room_1', 'user_leave', self.users[3], 3)
+
+        await asyncio.sleep(0.05)
+
+        self.channel_layer.group_send.assert_awaited_once_with('chat_room_1', {
+            'type': 'presence_delta',
+            'connected_users_count': 3,
+            'joined': [{'user_id': 'user-0', 'username': 'user0'}, {'user_id': 'user-1', 'username': 'user1'}],
+            'left': [{'user_id': 'user-2', 'username': 'user2'}]
+        })
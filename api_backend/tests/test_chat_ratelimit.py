@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.versioned.v1.chat.consumer import ChatConsumer
+from common.ratelimit import TokenBucket, consume_all
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        self.connection_bucket = TokenBucket('test:connection', rate=1, burst=2)
+        self.user_bucket = TokenBucket('test:user', rate=1, burst=3)
+        self.keys = [self.connection_bucket.get_key('conn1'), self.connection_bucket.get_key('conn2'),
+                     self.user_bucket.get_key('user1')]
+        self.connection_bucket.client.delete(*self.keys)
+
+    def tearDown(self):
+        self.connection_bucket.client.delete(*self.keys)
+
+    def consume(self, connection_id):
+        return consume_all([(self.connection_bucket, connection_id), (self.user_bucket, 'user1')])
+
+    def rewind(self, key, seconds):
+        # 마지막 충전 시각을 되돌려 그만큼 시간이 흐른 것처럼 만듭니다.
+        client = self.connection_bucket.client
+        client.hset(key, 'updated_at', float(client.hget(key, 'updated_at')) - seconds)
+
+    def test_burst_then_refill(self):
+        self.assertEqual(self.connection_bucket.consume('conn1'), (True, 0))
+        self.assertEqual(self.connection_bucket.consume('conn1'), (True, 0))
+        allowed, retry_after = self.connection_bucket.consume('conn1')
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 1, places=1)
+
+        self.rewind(self.connection_bucket.get_key('conn1'), 1)
+        self.assertEqual(self.connection_bucket.consume('conn1'), (True, 0))
+
+    def test_refill_uses_redis_clock(self):
+        self.connection_bucket.consume('conn1')
+
+        updated_at = float(self.connection_bucket.client.hget(self.connection_bucket.get_key('conn1'), 'updated_at'))
+        seconds, microseconds = self.connection_bucket.client.time()
+        self.assertAlmostEqual(updated_at, seconds + microseconds / 1000000, delta=1)
+
+    def test_user_bucket_is_shared_across_connections(self):
+        self.assertTrue(self.consume('conn1')[0])
+        self.assertTrue(self.consume('conn1')[0])
+        self.assertTrue(self.consume('conn2')[0])
+
+        self.assertFalse(self.consume('conn2')[0])
+
+    def test_rejected_request_does_not_spend_tokens(self):
+        self.consume('conn1')
+        self.consume('conn1')
+        self.assertFalse(self.consume('conn1')[0])
+
+        # 연결 버킷에서 거부된 요청은 사용자 버킷 토큰을 쓰지 않습니다.
+        self.assertTrue(self.consume('conn2')[0])
+
+
+class ChatConsumerRateLimitTests(SimpleTestCase):
+    async def test_rate_limited_frame_skips_save_and_broadcast(self):
+        consumer = ChatConsumer()
+        consumer.channel_name = 'test-channel'
+        consumer.group_name = 'chat_room_1'
+        consumer.channel_layer = mock.AsyncMock()
+        consumer.send_json = mock.AsyncMock()
+        consumer.chat_service = mock.Mock()
+        consumer.chat_service.consume_rate_limit = mock.AsyncMock(return_value=(False, 0.5))
+        consumer.chat_service.save_message = mock.AsyncMock()
+
+        await consumer.receive_json({'message': 'flood'})
+
+        consumer.send_json.assert_awaited_once_with({
+            'type': 'rate_limited', 'error': 'Too many messages', 'retry_after': 0.5
+        })
+        consumer.chat_service.save_message.assert_not_awaited()
+        consumer.channel_layer.group_send.assert_not_awaited()
@@ -0,0 +1,74 @@
+import time
+
+import arrow
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.bases.chat.models import ChatRoom, ChatRoomParticipant
+from api.bases.chat.retention import RetentionSweeper
+from api.bases.user.models import User
+
+
+class RetentionSweeperTests(TestCase):
+    def setUp(self):
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.users = [User.objects.create(username=f"user{index}") for index in range(4)]
+        for user in self.users:
+            ChatRoomParticipant.objects.create(user=user, chat_room=self.chat_room)
+        self.deleted_room_id = 987654
+        # 같은 Redis 의 다른 채팅방 key 는 건드리지 않도록 테스트 채팅방만 정리합니다.
+        self.sweeper = RetentionSweeper(interval=60, batch_size=2, participant_retention=60 * 60,
+                                        room_ids=[self.chat_room.id, self.deleted_room_id])
+        self.presence, self.history = self.sweeper.presence, self.sweeper.history
+        self._clear()
+
+    def tearDown(self):
+        self._clear()
+
+    def _clear(self):
+        for room_id in (self.chat_room.id, self.deleted_room_id):
+            self.presence.client.delete(*self.presence.get_keys(room_id), self.history.get_key(room_id))
+            self.presence.client.hdel(self.presence.members_key, str(room_id))
+        cache.delete(self.sweeper.lock_key)
+
+    def test_deletes_stale_participants_that_are_offline(self):
+        old = arrow.utcnow().shift(days=-2).datetime
+        ChatRoomParticipant.objects.filter(user__in=self.users[:3]).update(last_active=old)
+        self.presence.join(self.chat_room.id, self.users[0].id)
+
+        self.assertEqual(self.sweeper.sweep_participants(), 2)
+        self.assertEqual(set(ChatRoomParticipant.objects.values_list('user__username', flat=True)),
+                         {'user0', 'user3'})
+
+    def test_expires_crashed_connections_and_refreshes_member_counts(self):
+        self.presence.join(self.chat_room.id, self.users[0].id)
+        self.presence.join(self.chat_room.id, self.users[1].id)
+        # heartbeat 없이 끊긴 연결
+        presence_key = self.presence.get_keys(self.chat_room.id)[0]
+        self.presence.client.zadd(presence_key, {str(self.users[1].id): time.time() - 1000})
+
+        self.assertEqual(self.sweeper.sweep_presence(), 1)
+        self.assertEqual(self.presence.get_member_counts([self.chat_room.id]), {str(self.chat_room.id): 1})
+
+        # presence key 가 만료되어 사라진 방은 members hash 에서도 제거됩니다.
+        self.presence.client.delete(*self.presence.get_keys(self.chat_room.id))
+        self.sweeper.sweep_presence()
+        self.assertIsNone(self.presence.client.hget(self.presence.members_key, str(self.chat_room.id)))
+
+    def test_expires_idle_history_and_deletes_removed_rooms(self):
+        self.history.client.rpush(self.history.get_key(self.chat_room.id), '{}')
+        self.history.client.rpush(self.history.get_key(self.deleted_room_id), '{}')
+
+        report = self.sweeper.sweep_history()
+
+        self.assertEqual(report, {'history_expiry_set': 1, 'history_deleted': 1})
+        self.assertGreater(self.history.client.ttl(self.history.get_key(self.chat_room.id)), 0)
+        self.assertFalse(self.history.client.exists(self.history.get_key(self.deleted_room_id)))
+
+    def test_periodic_sweep_runs_once_per_interval(self):
+        self.history.client.rpush(self.history.get_key(self.deleted_room_id), '{}')
+
+        self.assertEqual(self.sweeper.sweep_if_due(), {
+            'participants_deleted': 0, 'presence_expired': 0, 'history_expiry_set': 0, 'history_deleted': 1,
+        })
+        self.assertIsNone(self.sweeper.sweep_if_due())
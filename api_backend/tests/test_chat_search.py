@@ -0,0 +1,120 @@
+import uuid
+from unittest import mock
+
+import arrow
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from api.bases.chat.models import ChatRoom, Message
+from api.bases.chat.persistence import MessagePersister
+from api.bases.chat.search import SqliteSearchBackend, get_query_terms, tokenize
+from api.bases.user.models import User
+from common.exceptions import InvalidSearchQuery
+from common.pagination import encode_cursor
+
+
+class TokenizerTests(SimpleTestCase):
+    def test_korean_bigrams_and_words(self):
+        self.assertEqual(tokenize('안녕하세요 Hello, 세계!'), ['안녕', '녕하', '하세', '세요', 'hello', '세계'])
+        self.assertEqual(tokenize('밥abc'), ['밥', 'abc'])
+
+    def test_query_terms(self):
+        self.assertEqual(get_query_terms('하세요 he'), [('하세', False), ('세요', False), ('he', True)])
+        self.assertEqual(get_query_terms('밥'), [('밥', True)])
+        with self.assertRaises(InvalidSearchQuery):
+            get_query_terms('?!')
+
+
+class MessageSearchApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.other_room = ChatRoom.objects.create(title="Other Room")
+        self.url = f'/v1/chat/{self.chat_room.pk}/search'
+
+    def _save(self, room, *contents):
+        persister = MessagePersister(batch_size=100, flush_interval=60)
+        now = arrow.now("Asia/Seoul")
+        for index, content in enumerate(contents):
+            persister.enqueue(uid=uuid.uuid4(), user_id=self.user.id, chat_room_id=room.id, content=content,
+                              created_at=now.shift(seconds=index).datetime)
+        with self.captureOnCommitCallbacks(execute=True):
+            persister.flush_sync()
+
+    def test_search_finds_korean_substrings_in_room(self):
+        self._save(self.chat_room, '오늘 회의는 3시에 시작합니다', '점심 뭐 먹을까요', 'Meeting notes 회의록')
+        self._save(self.other_room, '다른 방 회의')
+
+        response = self.client.get(self.url, {'q': '회의'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(message['content'] for message in response.data['results']),
+                         ['Meeting notes 회의록', '오늘 회의는 3시에 시작합니다'])
+        self.assertEqual(self.client.get(self.url, {'q': 'meet'}).data['results'][0]['content'],
+                         'Meeting notes 회의록')
+
+    def test_pages_are_ranked_without_repeats(self):
+        self._save(self.chat_room, *[f'검색 테스트 {index}' for index in range(4)], '검색 검색 검색 테스트')
+
+        contents, cursor = [], None
+        while True:
+            params = {'q': '검색', 'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(self.url, params)
+            contents += [message['content'] for message in response.data['results']]
+            # 첫 페이지 이후 저장된 메시지는 결과에 끼어들지 않습니다.
+            self._save(self.chat_room, '검색 새 메시지')
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(contents[0], '검색 검색 검색 테스트')
+        self.assertEqual(sorted(contents[1:]), [f'검색 테스트 {index}' for index in range(4)])
+
+    @override_settings(CHAT_SEARCH_MAX_CANDIDATES=2)
+    def test_pages_continue_into_older_windows(self):
+        self._save(self.chat_room, *[f'검색 {index}' for index in range(5)])
+
+        contents, cursor = [], None
+        while True:
+            params = {'q': '검색', 'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(self.url, params)
+            contents += [message['content'] for message in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        # 최근 구간부터 순서대로, 가장 오래된 메시지까지 한 번씩 조회됩니다.
+        self.assertEqual(len(contents), 5)
+        self.assertEqual(sorted(contents[:2]), ['검색 3', '검색 4'])
+        self.assertEqual(sorted(contents), [f'검색 {index}' for index in range(5)])
+
+    def test_invalid_cursor(self):
+        for cursor in ('not-a-cursor', encode_cursor([1, 2]), encode_cursor('x'), encode_cursor({'m': 'x'})):
+            response = self.client.get(self.url, {'q': '검색', 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'x' * 101}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_indexes_existing_messages(self):
+        Message.objects.create(user=self.user, chat_room=self.chat_room, content='이전에 저장된 메시지')
+        self.assertEqual(self.client.get(self.url, {'q': '저장'}).data['results'], [])
+
+        call_command('rebuild_message_search', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(len(self.client.get(self.url, {'q': '저장'}).data['results']), 1)
+
+    def test_index_failure_keeps_messages(self):
+        with mock.patch.object(SqliteSearchBackend, 'index', side_effect=Exception('fts down')):
+            self._save(self.chat_room, '색인 실패 메시지')
+
+        self.assertEqual(Message.objects.filter(content='색인 실패 메시지').count(), 1)
+        self.assertEqual(self.client.get(self.url, {'q': '색인'}).data['results'], [])
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import arrow
+from django.test import TestCase
+
+from api.bases.chat.models import ChatRoom, Message
+from api.bases.user.models import User
+from common.middleware import RedisCacheASGIMiddleware
+
+
+class TieredHistoryTests(TestCase):
+    def setUp(self):
+        self.middleware = RedisCacheASGIMiddleware(None)
+        self.user = User.objects.create(username="user1")
+        self.chat_room = ChatRoom.objects.create(title="Test Room")
+        self.middleware.history.clear(self.chat_room.id)
+
+        start = arrow.now("Asia/Seoul").shift(minutes=-10)
+        self.messages = [
+            Message.objects.create(user=self.user, chat_room=self.chat_room, content=f'message {index}',
+                                   created_at=start.shift(seconds=index).datetime)
+            for index in range(6)
+        ]
+
+    def tearDown(self):
+        self.middleware.history.clear(self.chat_room.id)
+
+    def _cache(self, messages):
+        for message in messages:
+            self.middleware.history.append(self.chat_room.id, {
+                'uid': str(message.uid),
+                'room_id': str(self.chat_room.id),
+                'user_id': str(self.user.id),
+                'username': self.user.username,
+                'message': message.content,
+                'created_at': message.created_at.isoformat()
+            })
+
+    async def test_hot_tail_is_served_from_cache(self):
+        self._cache(self.messages[-3:])
+
+        messages, cursor = await self.middleware.get_previous_messages(self.chat_room.id, count=2)
+
+        self.assertEqual([m['message'] for m in messages], ['message 4', 'message 5'])
+        self.assertIsNotNone(cursor)
+
+    async def test_continues_into_database_without_duplicates(self):
+        self._cache(self.messages[-2:])
+
+        messages, cursor = await self.middleware.get_previous_messages(self.chat_room.id, count=4)
+        older, last_cursor = await self.middleware.get_previous_messages(self.chat_room.id, cursor=cursor, count=4)
+
+        self.assertEqual([m['message'] for m in messages], [f'message {index}' for index in range(2, 6)])
+        self.assertEqual([m['message'] for m in older], ['message 0', 'message 1'])
+        self.assertIsNone(last_cursor)
+
+    async def test_cold_cache_falls_back_to_database(self):
+        messages, cursor = await self.middleware.get_previous_messages(self.chat_room.id, count=3)
+
+        self.assertEqual([m['message'] for m in messages], ['message 3', 'message 4', 'message 5'])
+        self.assertIsNotNone(cursor)
+
+    async def test_equal_timestamps_across_page_boundary(self):
+        tie = self.messages[-1].created_at + timedelta(seconds=1)
+        a, b, c = [
+            await Message.objects.acreate(user=self.user, chat_room=self.chat_room, content=content, created_at=value)
+            for content, value in (('a', tie), ('b', tie), ('c', tie + timedelta(seconds=1)))
+        ]
+        self._cache([a, b, c])
+
+        pages, cursor = [], None
+        while True:
+            messages, cursor = await self.middleware.get_previous_messages(self.chat_room.id, cursor=cursor, count=2)
+            pages.append([m['message'] for m in messages])
+            if not cursor:
+                break
+
+        self.assertEqual(pages[0], ['b', 'c'])
+        self.assertEqual(pages[1], ['message 5', 'a'])
+        self.assertEqual(sorted(sum(pages, [])), sorted(['a', 'b', 'c'] + [f'message {index}' for index in range(6)]))
@@ -0,0 +1,43 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from common.codecs import CODECS, MsgpackCodec, OrjsonCodec, StdlibJsonCodec, encode_all
+from common.renderers import CodecJSONRenderer
+
+
+class CodecTests(SimpleTestCase):
+    content = {'uid': 'a', 'message': '안녕하세요', 'connected_users_count': 3}
+
+    def test_round_trip(self):
+        for codec in (StdlibJsonCodec, OrjsonCodec, MsgpackCodec):
+            self.assertEqual(codec.decode(codec.encode(self.content)), self.content)
+
+    def test_encode_all_returns_frame_per_codec(self):
+        frames = encode_all(self.content)
+
+        self.assertEqual(set(frames), set(CODECS))
+        self.assertIsInstance(frames['json'], str)
+        self.assertIsInstance(frames['msgpack'], bytes)
+
+
+class CodecJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_renderer(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'created_at': datetime.datetime(2024, 1, 1, 9, 30, 0, 123456, tzinfo=datetime.timezone.utc),
+            'amount': decimal.Decimal('1.50'),
+            'title': '채팅방',
+            'items': [1, None, True],
+        }
+
+        rendered = CodecJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_empty_response(self):
+        self.assertEqual(CodecJSONRenderer().render(None), b'')
@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from api.bases.user.models import User, user_record_cache
+from common.caches import LocalTTLCache, get_or_compute_shared
+
+
+class LocalTTLCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LocalTTLCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    def test_expires_after_ttl(self):
+        cache = LocalTTLCache(max_size=2, ttl=60)
+        with mock.patch('common.caches.time') as mocked_time:
+            mocked_time.monotonic.return_value = 0
+            cache.set('a', 1)
+            mocked_time.monotonic.return_value = 61
+
+            self.assertIsNone(cache.get('a'))
+
+
+class UserRecordCacheTests(TestCase):
+    def setUp(self):
+        user_record_cache.clear()
+        self.user = User.objects.create(username="user1")
+
+    def test_cached_record_skips_database(self):
+        User.get_cached(self.user.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(User.get_cached(self.user.id).username, "user1")
+
+    def test_update_invalidates_record(self):
+        User.get_cached(self.user.id)
+        self.user.username = "renamed"
+        self.user.save()
+
+        self.assertEqual(User.get_cached(self.user.id).username, "renamed")
+
+
+class SharedCacheTests(SimpleTestCase):
+    key = 'test:shared'
+
+    def setUp(self):
+        cache.delete_many([self.key, f'{self.key}:lock'])
+
+    def tearDown(self):
+        cache.delete_many([self.key, f'{self.key}:lock'])
+
+    def test_computes_once_within_ttl(self):
+        compute = mock.Mock(return_value={'value': 1})
+
+        self.assertEqual(get_or_compute_shared(self.key, 60, compute), {'value': 1})
+        self.assertEqual(get_or_compute_shared(self.key, 60, compute), {'value': 1})
+        compute.assert_called_once()
+
+    def test_waits_for_worker_holding_lock(self):
+        cache.add(f'{self.key}:lock', 1, 5)
+        compute = mock.Mock(return_value='computed')
+
+        def fill_cache(seconds):
+            cache.set(self.key, 'from other worker', 60)
+
+        with mock.patch('common.caches.time.sleep', side_effect=fill_cache):
+            self.assertEqual(get_or_compute_shared(self.key, 60, compute), 'from other worker')
+        compute.assert_not_called()
+
+    def test_waiter_that_times_out_keeps_other_workers_lock(self):
+        cache.add(f'{self.key}:lock', 1, 5)
+
+        with mock.patch('common.caches.time.sleep'):
+            self.assertEqual(get_or_compute_shared(self.key, 60, lambda: 'computed', lock_timeout=0), 'computed')
+        self.assertIsNotNone(cache.get(f'{self.key}:lock'))
@@ -0,0 +1,58 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+
+from common.metrics import Counter, Histogram, MetricsRegistry, observe_latency
+
+
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_render(self):
+        counter = Counter('test_total', 'Test counter.', ['kind'], registry=self.registry)
+
+        counter.inc(kind='a')
+        counter.inc(2, kind='a')
+
+        output = self.registry.render()
+        self.assertIn('# TYPE test_total counter', output)
+        self.assertIn('test_total{kind="a"} 3', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Test histogram.', buckets=(0.1, 1.0), registry=self.registry)
+
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        output = self.registry.render()
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', output)
+        self.assertIn('test_seconds_bucket{le="1.0"} 2', output)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', output)
+        self.assertIn('test_seconds_count 3', output)
+
+    async def test_observe_latency_async(self):
+        histogram = Histogram('test_async_seconds', 'Test histogram.', ['call'], registry=self.registry)
+
+        @observe_latency(histogram, call='work')
+        async def work():
+            return 'done'
+
+        self.assertEqual(await work(), 'done')
+        counts, _ = histogram.get(call='work')
+        self.assertEqual(sum(counts), 1)
+
+    def test_duplicated_metric_name(self):
+        Counter('dup_total', 'Test counter.', registry=self.registry)
+
+        with self.assertRaises(ValueError):
+            Counter('dup_total', 'Test counter.', registry=self.registry)
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    def test_metrics_endpoint(self):
+        response = APIClient().get('/v1/status/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'# TYPE chat_live_sockets gauge', response.content)
+        self.assertIn(b'# TYPE chat_consumer_handler_seconds histogram', response.content)
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIClient, APITestCase
+
+from api.bases.user.models import User
+from api.versioned.v1.user.views import UserViewSet
+from common.profiling import RequestProfile, profile_serializer_data
+
+
+class ServerTimingMiddlewareTests(APITestCase):
+    def setUp(self):
+        User.objects.create(username='user1')
+
+    def test_disabled_by_default(self):
+        response = APIClient().get('/v1/user/')
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_server_timing_header(self):
+        response = APIClient().get('/v1/user/')
+
+        server_timing = response['Server-Timing']
+        for name in ('total', 'sql', 'cache', 'serializer'):
+            self.assertIn(f'{name};dur=', server_timing)
+        self.assertIn('desc="SQL (1)"', server_timing)
+
+    def test_serializer_time_is_measured_when_data_is_read(self):
+        profile_serializer_data()
+        view = UserViewSet(request=None, format_kwarg=None, action='list')
+        profile = RequestProfile()
+
+        with profile.activate(), mock.patch('api.versioned.v1.user.serializers.UserSerializer.to_representation',
+                                            return_value={}) as to_representation:
+            # 프로파일링이 켜져 있어도 serializer 를 만들기만 해서는 직렬화하지 않습니다.
+            serializer = view.get_serializer(User.objects.all(), many=True)
+            to_representation.assert_not_called()
+            serializer.data
+
+        to_representation.assert_called_once()
+        self.assertGreater(profile.serializer_time, 0)
+
+    @override_settings(SERVER_TIMING_ENABLED=True, SERVER_TIMING_SLOW_REQUEST_MS=0)
+    def test_slow_request_logs_slowest_queries(self):
+        with mock.patch('common.middleware.logger') as logger:
+            APIClient().get('/v1/user/')
+
+        message = logger.warning.call_args[0][0]
+        self.assertIn('Slow request GET /v1/user/', message)
+        self.assertIn('FROM "user_user"', message)
+
+
+class RequestProfileTests(SimpleTestCase):
+    def test_keeps_only_slowest_queries(self):
+        execute = mock.Mock()
+
+        with mock.patch('common.profiling.time.perf_counter', side_effect=[0, 0, 3, 0, 1, 0, 2]):
+            profile = RequestProfile(slow_query_count=2)
+            for sql in ('q3', 'q1', 'q2'):
+                profile(execute, sql, None, False, {})
+
+        self.assertEqual(profile.sql_count, 3)
+        self.assertEqual([sql for _, sql in profile.get_slow_queries()], ['q3', 'q2'])
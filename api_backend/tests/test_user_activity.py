@@ -0,0 +1,54 @@
+from unittest import mock
+
+import arrow
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from api.bases.user.activity import ActivityTracker
+from api.bases.user.models import User
+
+
+class ActivityTrackerTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create(username="user1")
+        self.user2 = User.objects.create(username="user2")
+        self.tracker = ActivityTracker(flush_interval=60)
+
+    def test_keeps_latest_seen_time_per_user(self):
+        now = arrow.now("Asia/Seoul")
+        for minutes in (-3, -2, -1):
+            self.tracker.record(self.user1.id, now.shift(minutes=minutes).datetime)
+        self.tracker.record(self.user2.id, now.datetime)
+
+        self.assertEqual(self.tracker.pending_count, 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.tracker.flush_sync(), 2)
+
+        self.user1.refresh_from_db()
+        self.assertEqual(self.user1.last_active, now.shift(minutes=-1).datetime)
+        self.assertEqual(self.tracker.get_stats(), {'pending': 0, 'flushed': 2, 'dropped': 0})
+
+    def test_failed_flush_keeps_newer_seen_time(self):
+        now = arrow.now("Asia/Seoul")
+        self.tracker.record(self.user1.id, now.shift(minutes=-2).datetime)
+        with mock.patch.object(User.objects, 'bulk_update', side_effect=Exception('db down')):
+            self.assertEqual(self.tracker.flush_sync(), 0)
+        self.tracker.record(self.user1.id, now.datetime)
+
+        self.assertEqual(self.tracker.flush_sync(), 1)
+        self.user1.refresh_from_db()
+        self.assertEqual(self.user1.last_active, now.datetime)
+
+    def test_flush_without_pending_does_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tracker.flush_sync(), 0)
+
+    async def test_flush_timer_starts_only_on_event_loop(self):
+        # database_sync_to_async 등 worker thread 에서는 실행 중인 이벤트 루프가 없어 타이머를 시작하지 않습니다.
+        await sync_to_async(self.tracker.record)(self.user1.id)
+        self.assertIsNone(self.tracker._timer_task)
+
+        self.tracker.record(self.user1.id)
+        self.assertFalse(self.tracker._timer_task.done())
+        self.tracker._timer_task.cancel()
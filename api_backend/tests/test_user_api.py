@@ -1,8 +1,11 @@
+import arrow
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from api.bases.user.models import User
 from api.versioned.v1.user.serializers import UserSerializer
+from common.pagination import decode_cursor, encode_cursor
 
 
 class UserViewSetTests(APITestCase):
@@ -57,3 +60,57 @@ class UserViewSetTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(User.objects.count(), 1)
+
+
+class ActiveUsersViewTests(APITestCase):
+    def setUp(self):
+        cache.delete_pattern('user:active:*')
+        now = arrow.now('Asia/Seoul')
+        self.users = [
+            User.objects.create(username=f'active{index}') for index in range(3)
+        ]
+        for index, user in enumerate(self.users):
+            User.objects.filter(id=user.id).update(last_active=now.shift(minutes=-index).datetime)
+        self.inactive = User.objects.create(username='inactive')
+        User.objects.filter(id=self.inactive.id).update(last_active=now.shift(hours=-1).datetime)
+        self.url = '/v1/user/active'
+
+    def tearDown(self):
+        cache.delete_pattern('user:active:*')
+
+    def test_paginates_recent_users_first(self):
+        first = self.client.get(self.url, {'limit': 2})
+        second = self.client.get(self.url, {'limit': 2, 'cursor': first.data['next_cursor']})
+
+        self.assertEqual([user['username'] for user in first.data['results']], ['active0', 'active1'])
+        self.assertEqual([user['username'] for user in second.data['results']], ['active2'])
+        self.assertIsNone(second.data['next_cursor'])
+
+    def test_page_is_served_from_shared_cache(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_equivalent_cursors_share_cache_entry(self):
+        cursor = self.client.get(self.url, {'limit': 2}).data['next_cursor']
+        self.client.get(self.url, {'limit': 2, 'cursor': cursor})
+        # 같은 위치를 가리키는 다른 표기의 cursor
+        equivalent = encode_cursor({**decode_cursor(cursor), 'x': 1})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'limit': 2, 'cursor': equivalent})
+
+        self.assertEqual([user['username'] for user in response.data['results']], ['active2'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # id 가 없는 cursor
+        response = self.client.get(self.url, {'cursor': encode_cursor({'t': arrow.now("Asia/Seoul").isoformat()})})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,57 @@
+import math
+import subprocess
+import threading
+import time
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values, digits=3):
+    """p50 / p99 / max 요약 (values 는 ms 단위)"""
+    if not values:
+        return {'p50': None, 'p99': None, 'max': None}
+    return {
+        'p50': round(percentile(values, 50), digits),
+        'p99': round(percentile(values, 99), digits),
+        'max': round(max(values), digits),
+    }
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper 로 등록해 실행된 SQL 의 수와 시간을 집계합니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.count += 1
+                self.duration += elapsed
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.duration = 0.0
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+
+class LocalTTLCache:
+    """
+    프로세스 내부에서만 사용하는 크기 제한(LRU) + TTL 캐시입니다.
+
+    다른 워커와 공유되지 않으므로, 변경이 잦지 않은 가벼운 레코드 조회에만 사용합니다.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, default_func):
+        value = self.get(key)
+        if value is None:
+            value = default_func()
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def get_or_compute_shared(key, ttl, compute, lock_timeout=5, wait_interval=0.05):
+    """
+    여러 워커가 공유하는 캐시(Redis)에서 key 를 조회하고, 없으면 한 워커만 compute 를 실행합니다.
+
+    다른 워커는 lock_timeout 동안 결과가 채워지기를 기다리며, 그래도 없으면 직접 계산합니다.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    acquired = cache.add(lock_key, 1, lock_timeout)
+    if not acquired:
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(wait_interval)
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+    try:
+        value = compute()
+        cache.set(key, value, ttl)
+    finally:
+        # 기다리다 직접 계산한 워커는 다른 워커가 잡은 lock 을 지우지 않습니다.
+        if acquired:
+            cache.delete(lock_key)
+    return value
@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+from bisect import bisect
+
+from channels_redis.core import RedisChannelLayer
+from channels_redis.pubsub import RedisPubSubChannelLayer, RedisPubSubLoopLayer
+from channels_redis.utils import _wrap_close, decode_hosts
+
+
+class HashRing:
+    """
+    가상 노드를 사용하는 consistent hash ring 입니다.
+
+    노드는 주소 같은 고정된 이름으로 배치되므로, 노드를 하나 추가해도
+    기존 키 중 약 1/N 만 새 노드로 옮겨지고 나머지 키의 배치는 유지됩니다.
+    """
+
+    def __init__(self, node_names, replicas=160):
+        self.node_names = list(node_names)
+        self._ring = sorted(
+            (self.hash(f'{name}#{replica}'), index)
+            for index, name in enumerate(self.node_names)
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in self._ring]
+
+    @staticmethod
+    def hash(value):
+        if isinstance(value, str):
+            value = value.encode('utf8')
+        return int.from_bytes(hashlib.md5(value).digest()[:8], 'big')
+
+    def get_index(self, key):
+        if len(self.node_names) == 1:
+            return 0
+        position = bisect(self._hashes, self.hash(key)) % len(self._ring)
+        return self._ring[position][1]
+
+
+def get_node_names(hosts):
+    return [host.get('address') or str(sorted(host.items())) for host in decode_hosts(hosts)]
+
+
+class ShardedRedisChannelLayer(RedisChannelLayer):
+    """
+    hosts 에 지정한 여러 Redis 노드에 그룹(chat_room_{id})과 채널을 consistent hash 로 나눠 배치합니다.
+
+    channels_redis 기본 배치(crc32 % 노드 수)와 달리 노드를 추가해도 대부분의 방이 기존 노드에 남습니다.
+    """
+
+    def __init__(self, hosts=None, *args, **kwargs):
+        super().__init__(hosts, *args, **kwargs)
+        self.hash_ring = HashRing(get_node_names(hosts))
+
+    def consistent_hash(self, value):
+        return self.hash_ring.get_index(value)
+
+
+class ShardedRedisPubSubLoopLayer(RedisPubSubLoopLayer):
+    def __init__(self, hosts=None, *args, **kwargs):
+        super().__init__(hosts, *args, **kwargs)
+        self.hash_ring = HashRing(get_node_names(hosts))
+
+    def _get_shard(self, channel_or_group_name):
+        return self._shards[self.hash_ring.get_index(channel_or_group_name)]
+
+
+class ShardedRedisPubSubChannelLayer(RedisPubSubChannelLayer):
+    """
+    Redis pub/sub 기반 레이어의 샤딩 버전입니다.
+
+    그룹 메시지를 그룹 크기와 관계없이 PUBLISH 한 번으로 전달하므로 인원이 많은 방에 적합합니다.
+    """
+
+    def _get_layer(self):
+        loop = asyncio.get_running_loop()
+
+        try:
+            layer = self._layers[loop]
+        except KeyError:
+            layer = ShardedRedisPubSubLoopLayer(*self._args, **self._kwargs, channel_layer=self)
+            self._layers[loop] = layer
+            _wrap_close(self, loop)
+
+        return layer
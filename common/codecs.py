@@ -0,0 +1,70 @@
+import json
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StdlibJsonCodec:
+    """텍스트 프레임 (표준 json)"""
+    name = 'json'
+
+    @staticmethod
+    def encode(content):
+        return json.dumps(content)
+
+    @staticmethod
+    def decode(data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """텍스트 프레임 (orjson)"""
+    name = 'json'
+    # datetime 은 DRF 와 같은 형식(밀리초, UTC 는 Z)으로 인코딩되도록 DRF encoder 에 넘깁니다.
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    @classmethod
+    def encode(cls, content):
+        return cls.encode_bytes(content).decode()
+
+    @classmethod
+    def encode_bytes(cls, content):
+        # orjson 이 직접 처리하지 못하는 타입(Decimal, lazy str 등)도 DRF encoder 로 넘깁니다.
+        return orjson.dumps(content, default=JSONEncoder().default, option=cls.option)
+
+    @staticmethod
+    def decode(data):
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    """바이너리 프레임 (msgpack subprotocol)"""
+    name = 'msgpack'
+
+    @staticmethod
+    def encode(content):
+        return msgpack.packb(content)
+
+    @staticmethod
+    def decode(data):
+        return msgpack.unpackb(data)
+
+
+JSON_CODECS = {
+    'json': StdlibJsonCodec,
+    'orjson': OrjsonCodec,
+}
+
+# 웹소켓 텍스트 프레임과 DRF 응답에 사용할 JSON 구현 (JSON_CODEC 설정)
+JsonCodec = JSON_CODECS[settings.JSON_CODEC]
+
+CODECS = {codec.name: codec for codec in (JsonCodec, MsgpackCodec)}
+
+
+def encode_all(content):
+    """
+    모든 codec 으로 한 번씩 인코딩한 프레임을 반환합니다. 그룹 이벤트에 담아 수신자별 재인코딩을 피합니다.
+    """
+    return {name: codec.encode(content) for name, codec in CODECS.items()}
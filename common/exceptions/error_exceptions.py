@@ -9,3 +9,15 @@ class ExpiredApiCacheData(CustomAPIException):
     error_code = 'E01'
     default_detail = 'API Cache 데이터가 만료되어 존재하지 않습니다.'
 
+
+
+class InvalidCursor(CustomAPIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    error_code = 'E02'
+    default_detail = '유효하지 않은 cursor 입니다.'
+
+
+class InvalidSearchQuery(CustomAPIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    error_code = 'E03'
+    default_detail = '유효하지 않은 검색어 입니다.'
@@ -0,0 +1,54 @@
+import json
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from common.utils import get_redis_script
+
+
+class RoomMessageHistory:
+    """
+    채팅방별 최근 메시지를 Redis list 링 버퍼로 보관합니다.
+
+    append 는 RPUSH / LTRIM / EXPIRE 를 Lua 스크립트 한 번으로 처리하므로
+    여러 워커가 동시에 기록해도 메시지가 유실되지 않고, 방의 히스토리 길이와
+    관계없이 메시지 한 건당 비용이 일정합니다.
+    """
+    key_format = 'chat:{room_id}:messages'
+
+    # KEYS[1]: 히스토리 list, ARGV: 메시지, 최대 길이, 히스토리 TTL
+    append_script = """
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+    redis.call('LTRIM', KEYS[1], -tonumber(ARGV[2]), -1)
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return 1
+    """
+
+    def __init__(self, max_length=None, ttl=None, alias='default'):
+        self.max_length = max_length or settings.CHAT_HISTORY_MAX_LENGTH
+        self.ttl = ttl or settings.CHAT_HISTORY_TTL
+        self.alias = alias
+
+    @property
+    def client(self):
+        return get_redis_connection(self.alias)
+
+    def get_key(self, room_id):
+        return self.key_format.format(room_id=room_id)
+
+    def append(self, room_id, message):
+        args = [json.dumps(message), self.max_length, self.ttl]
+        append = get_redis_script(self.alias, self.append_script)
+        append(keys=[self.get_key(room_id)], args=args)
+
+    def range(self, room_id, count=50):
+        if count <= 0:
+            return []
+        raw_messages = self.client.lrange(self.get_key(room_id), -count, -1)
+        return [json.loads(message) for message in raw_messages]
+
+    def length(self, room_id):
+        return self.client.llen(self.get_key(room_id))
+
+    def clear(self, room_id):
+        self.client.delete(self.get_key(room_id))
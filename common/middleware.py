@@ -1,66 +1,146 @@
 
-import json
+import logging
+from contextlib import ExitStack
+from datetime import datetime
 
-import arrow
-import redis
 from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
-from django.core.cache import cache
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from api.bases.chat.models import Message
+from common.history import RoomMessageHistory
+from common.metrics import Histogram, observe_latency
+from common.pagination import HistoryCursor
+from common.profiling import RequestProfile, profile_serializer_data
+
+logger = logging.getLogger(__name__)
+
+CACHE_CALL_SECONDS = Histogram(
+    'chat_cache_call_seconds', 'RedisCacheASGIMiddleware cache call latency in seconds.', ['call']
+)
+
 
 class RedisCacheASGIMiddleware:
     def __init__(self, inner):
         self.inner = inner
+        self.history = RoomMessageHistory()
 
     async def __call__(self, scope, receive, send):
-        if scope['type'] == 'websocket':
-            return await self.websocket_middleware(scope, receive, send)
         return await self.inner(scope, receive, send)
 
-    async def websocket_middleware(self, scope, receive, send):
-        async def wrapped_receive():
-            return await receive()
-
-        async def wrapped_send(message):
-            if message['type'] == 'websocket.send':
-                await self.cache_message(scope, message)
-            await send(message)
-
-        return await self.inner(scope, wrapped_receive, wrapped_send)
-
-    async def cache_message(self, scope, message):
-        if 'text' in message:
-            try:
-                data = json.loads(message['text'])
-                path_parts = scope['path'].split('/')
-                if len(path_parts) > 3:
-                    room_name = path_parts[3]
-                    user_id = path_parts[-1]
-                    if 'message' in data and 'username' in data:
-                        key = f"chat:{room_name}:messages"
-                        cached_messages = await sync_to_async(cache.get)(key, [])
-                        cache_data = json.dumps({
-                            'room_id': room_name,
-                            'user_id': user_id,
-                            'username': data['username'],
-                            'message': data['message'],
-                            'created_at': arrow.now("Asia/Seoul").isoformat()
-                        })
-                        cached_messages.append(cache_data)
-                        await database_sync_to_async(cache.set)(key, cached_messages, timeout=None)
-            except json.JSONDecodeError:
-                pass
-
-    async def get_cached_messages(self, room_name, count=50):
-        key = f"chat:{room_name}:messages"
-        messages = await database_sync_to_async(cache.get)(key, [])
-        return [json.loads(msg) for msg in messages]
-
-
-    async def get_previous_messages(self, room_id, last_message_id=None, count=50):
-        cached_messages = await self.get_cached_messages(room_id, count)
-        # if len(cached_messages) < count:
-        #     db_messages = await self.get_db_messages(room_id, last_message_id, count - len(cached_messages))
-        #     messages = cached_messages + db_messages
-        # else:
-        #     messages = cached_messages
-        return cached_messages
\ No newline at end of file
+    @observe_latency(CACHE_CALL_SECONDS, call='cache_message')
+    async def cache_message(self, room_id, message):
+        """
+        메시지 수신 시점(ChatService.save_message)에 메시지당 한 번만 호출됩니다.
+        """
+        await sync_to_async(self.history.append)(room_id, message)
+
+    @observe_latency(CACHE_CALL_SECONDS, call='get_cached_messages')
+    async def get_cached_messages(self, room_name, count=50, before=None, seen=()):
+        if before is None:
+            return await sync_to_async(self.history.range)(room_name, count)
+
+        # cursor 가 캐시 구간 안을 가리키면 그보다 오래된 메시지와, 같은 시각 중 아직 반환하지 않은 메시지만 잘라서 반환
+        messages = await sync_to_async(self.history.range)(room_name, self.history.max_length)
+        messages = [message for message in messages
+                    if datetime.fromisoformat(message['created_at']) < before
+                    or (datetime.fromisoformat(message['created_at']) == before and message.get('uid') not in seen)]
+        return messages[-count:]
+
+    @database_sync_to_async
+    def get_db_messages(self, room_id, before=None, count=50, exclude_uids=None):
+        return Message.get_previous_messages(room_id, before=before, limit=count, exclude_uids=exclude_uids)
+
+    async def get_previous_messages(self, room_id, cursor=None, count=50):
+        """
+        Redis 의 최근 메시지를 먼저 사용하고, 부족한 만큼 DB 에서 이어서 조회합니다.
+
+        메시지는 오래된 순서로 반환하며, 다음(더 오래된) 페이지를 위한 cursor 를 함께 반환합니다.
+        캐시 구간에서 끝난 cursor 는 id 없이 created_at 과 그 시각에 반환한 uid 만 담습니다.
+        """
+        before = HistoryCursor.decode(cursor) if cursor else None
+
+        cached_messages = []
+        if before is None or before[1] is None:
+            cached_messages = await self.get_cached_messages(
+                room_id, count, before=before and before[0], seen=before[2] if before else ()
+            )
+
+        if len(cached_messages) >= count:
+            return cached_messages, self.get_next_cursor(cached_messages, before)
+
+        if cached_messages:
+            oldest = datetime.fromisoformat(cached_messages[0]['created_at'])
+            before = (oldest, None, self.get_seen(cached_messages, oldest, before))
+
+        remaining = count - len(cached_messages)
+        cached_uids = {message.get('uid') for message in cached_messages}
+        db_messages = await self.get_db_messages(
+            room_id, before=before and before[:2], count=remaining + 1, exclude_uids=before and before[2]
+        )
+        db_messages = [message for message in db_messages if str(message['uid']) not in cached_uids]
+
+        messages = [self.to_cache_format(room_id, message) for message in reversed(db_messages[:remaining])]
+        messages += cached_messages
+        next_cursor = None
+        if len(db_messages) > remaining:
+            next_cursor = self.get_next_cursor(messages, before, pk=db_messages[remaining - 1]['id'])
+        return messages, next_cursor
+
+    @staticmethod
+    def get_seen(messages, oldest, before):
+        """oldest 와 같은 시각에 반환한 uid 목록. 이전 cursor 와 경계 시각이 같으면 이전 목록도 이어받습니다."""
+        seen = {message['uid'] for message in messages if datetime.fromisoformat(message['created_at']) == oldest}
+        if before and before[0] == oldest:
+            seen |= before[2]
+        return seen
+
+    def get_next_cursor(self, messages, before, pk=None):
+        oldest = datetime.fromisoformat(messages[0]['created_at'])
+        return HistoryCursor.encode(oldest, pk, self.get_seen(messages, oldest, before))
+
+    @staticmethod
+    def to_cache_format(room_id, message):
+        return {
+            'uid': str(message['uid']),
+            'room_id': str(room_id),
+            'user_id': str(message['user_id']),
+            'username': message['user__username'],
+            'message': message['content'],
+            'created_at': message['created_at'].isoformat()
+        }
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 전체 / SQL / 캐시 / serializer 시간을 Server-Timing 헤더로 내려주고,
+    SERVER_TIMING_SLOW_REQUEST_MS 를 넘는 요청은 가장 느린 쿼리와 함께 로그로 남깁니다.
+
+    SERVER_TIMING_ENABLED 가 꺼져 있으면 미들웨어 체인에서 제외됩니다.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        profile_serializer_data()
+        self.get_response = get_response
+        self.slow_request_ms = settings.SERVER_TIMING_SLOW_REQUEST_MS
+        self.slow_query_count = settings.SERVER_TIMING_SLOW_QUERY_COUNT
+
+    def __call__(self, request):
+        profile = RequestProfile(self.slow_query_count)
+        with ExitStack() as stack:
+            stack.enter_context(profile.activate())
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+
+        response['Server-Timing'] = profile.get_server_timing()
+        total_ms = profile.total_time * 1000
+        if total_ms >= self.slow_request_ms:
+            slow_queries = '\n'.join(f'  {elapsed * 1000:.2f}ms {sql}' for elapsed, sql in profile.get_slow_queries())
+            logger.warning(f'Slow request {request.method} {request.get_full_path()} {total_ms:.2f}ms '
+                           f'(sql {profile.sql_count}, cache {profile.cache_count})\n{slow_queries}')
+        return response
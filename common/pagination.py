@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from common.exceptions import InvalidCursor
+
+
+def encode_cursor(data):
+    raw = json.dumps(data, default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor
+
+
+class KeysetCursor:
+    """
+    (정렬 시각, id) 키셋을 외부에 노출되지 않는 opaque 문자열로 변환합니다.
+
+    decode 는 id 를 pk_type 으로 변환하며, 변환할 수 없으면 InvalidCursor 를 발생시킵니다.
+    """
+
+    @staticmethod
+    def encode(position, pk=None):
+        return encode_cursor({'t': position.isoformat(), 'i': pk})
+
+    @staticmethod
+    def decode(cursor, pk_type=int):
+        data = decode_cursor(cursor)
+        try:
+            pk = data.get('i')
+            return datetime.fromisoformat(data['t']), pk_type(pk) if pk is not None else None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise InvalidCursor
+
+
+class HistoryCursor:
+    """
+    채팅 히스토리용 cursor 입니다. KeysetCursor 의 (시각, id) 에 경계 시각과 같은 시각에 이미 반환한 메시지 uid 를 함께 담습니다.
+
+    Redis 캐시 구간의 메시지는 아직 id 가 없으므로, 같은 시각의 메시지가 페이지 경계에 걸쳐도 uid 로 구분합니다.
+    """
+
+    @staticmethod
+    def encode(position, pk=None, seen=()):
+        return encode_cursor({'t': position.isoformat(), 'i': pk, 'u': sorted(seen)})
+
+    @staticmethod
+    def decode(cursor):
+        position, pk = KeysetCursor.decode(cursor)
+        try:
+            seen = {str(uuid.UUID(uid)) for uid in decode_cursor(cursor).get('u') or []}
+        except (ValueError, TypeError, AttributeError):
+            raise InvalidCursor
+        return position, pk, seen
+
+
+class RankCursor:
+    """
+    (점수, id) 키셋과 순위를 매기는 후보 구간의 최대 id(window)를 opaque 문자열로 변환합니다.
+
+    점수와 id 가 None 이면 해당 구간의 첫 페이지입니다.
+    """
+
+    @staticmethod
+    def encode(score, pk, window):
+        return encode_cursor({'s': score, 'i': pk, 'm': window})
+
+    @staticmethod
+    def decode(cursor):
+        data = decode_cursor(cursor)
+        try:
+            score, pk = data.get('s'), data.get('i')
+            if score is None or pk is None:
+                return None, None, int(data['m'])
+            return float(score), int(pk), int(data['m'])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise InvalidCursor
+
+
+class LimitQueryParamMixin:
+    """
+    limit 쿼리 파라미터로 페이지 크기를 받고, 1 ~ max_page_size 범위로 제한합니다.
+    """
+    page_size = 50
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get('limit', self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
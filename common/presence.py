@@ -0,0 +1,149 @@
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from common.utils import get_redis_script
+from common.versions import ResourceVersions
+
+
+class RoomPresence:
+    """
+    채팅방별 접속 중인 사용자를 Redis sorted set 으로 관리합니다.
+
+    member 는 user_id, score 는 마지막 heartbeat 시각이며, 같은 사용자의 여러 연결은
+    참조 카운트 hash 로 묶습니다. heartbeat 가 timeout 이상 끊긴 사용자는
+    join / leave / sweep 시 함께 정리됩니다.
+
+    채팅방 목록에서 한 번에 읽을 수 있도록 방별 접속자 수를 members hash 에도 함께 기록하고,
+    접속자 구성이 바뀌면 채팅방 목록 / 상세 / 접속자 목록의 ETag 버전을 올립니다.
+    """
+    key_format = 'chat:{room_id}:presence'
+    refs_key_format = 'chat:{room_id}:presence:refs'
+    members_key = 'chat:presence:members'
+
+    # 모든 스크립트 공통: KEYS[1] presence zset, KEYS[2] 연결 참조 카운트 hash, KEYS[3] 방별 접속자 수 hash,
+    # KEYS[4] 리소스 버전 hash, ARGV[1] 만료 기준 시각, ARGV[2] room_id
+    expire_snippet = """
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 1000)
+    if #expired > 0 then
+        redis.call('ZREM', KEYS[1], unpack(expired))
+        redis.call('HDEL', KEYS[2], unpack(expired))
+    end
+    local changed = #expired > 0
+    """
+
+    # 현재 접속자 수를 members hash 에 기록하고, 접속자 구성이 바뀌었으면 버전을 올립니다.
+    # (버전 이름은 ChatRoom.get_version_names 와 접속자 목록 view 의 etag_action_map 과 같습니다.)
+    # 만료된 presence key 를 sweep 으로 정리할 때처럼 기록된 접속자 수만 바뀌는 경우도 버전을 올립니다.
+    count_snippet = """
+    local count = redis.call('ZCARD', KEYS[1])
+    local previous = tonumber(redis.call('HGET', KEYS[3], ARGV[2]) or 0)
+    if count > 0 then
+        redis.call('HSET', KEYS[3], ARGV[2], count)
+    else
+        redis.call('HDEL', KEYS[3], ARGV[2])
+    end
+    if changed or count ~= previous then
+        redis.call('HINCRBY', KEYS[4], 'chat:rooms', 1)
+        redis.call('HINCRBY', KEYS[4], 'chat:room:' .. ARGV[2], 1)
+        redis.call('HINCRBY', KEYS[4], 'chat:room:' .. ARGV[2] .. ':users', 1)
+    end
+    """
+
+    sweep_script = expire_snippet + count_snippet + """
+    return #expired
+    """
+
+    # ARGV[3]: user_id, ARGV[4]: 현재 시각, ARGV[5]: key TTL
+    join_script = expire_snippet + """
+    redis.call('HINCRBY', KEYS[2], ARGV[3], 1)
+    if redis.call('ZADD', KEYS[1], ARGV[4], ARGV[3]) == 1 then
+        changed = true
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+    """ + count_snippet + """
+    return count
+    """
+
+    # ARGV[3]: user_id
+    leave_script = expire_snippet + """
+    if redis.call('HINCRBY', KEYS[2], ARGV[3], -1) <= 0 then
+        redis.call('HDEL', KEYS[2], ARGV[3])
+        if redis.call('ZREM', KEYS[1], ARGV[3]) == 1 then
+            changed = true
+        end
+    end
+    """ + count_snippet + """
+    return count
+    """
+
+    # ARGV[3]: user_id, ARGV[4]: 현재 시각, ARGV[5]: key TTL
+    heartbeat_script = """
+    redis.call('HSETNX', KEYS[2], ARGV[3], 1)
+    local changed = redis.call('ZADD', KEYS[1], ARGV[4], ARGV[3]) == 1
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+    """ + count_snippet + """
+    return 1
+    """
+
+    def __init__(self, timeout=None, alias='default'):
+        self.timeout = timeout or settings.CHAT_PRESENCE_TIMEOUT
+        self.key_ttl = settings.CHAT_HISTORY_TTL
+        self.alias = alias
+
+    @property
+    def client(self):
+        return get_redis_connection(self.alias)
+
+    def get_keys(self, room_id):
+        return [self.key_format.format(room_id=room_id), self.refs_key_format.format(room_id=room_id)]
+
+    def get_script_keys(self, room_id):
+        return self.get_keys(room_id) + [self.members_key, ResourceVersions.key]
+
+    def get_cutoff(self):
+        return time.time() - self.timeout
+
+    def _run(self, script, room_id, *args):
+        args = (self.get_cutoff(), str(room_id)) + args
+        return get_redis_script(self.alias, script)(keys=self.get_script_keys(room_id), args=args)
+
+    def join(self, room_id, user_id):
+        """연결을 등록하고 현재 접속 사용자 수를 반환합니다."""
+        return self._run(self.join_script, room_id, str(user_id), time.time(), self.key_ttl)
+
+    def leave(self, room_id, user_id):
+        """연결을 해제하고 현재 접속 사용자 수를 반환합니다."""
+        return self._run(self.leave_script, room_id, str(user_id))
+
+    def heartbeat(self, room_id, user_id):
+        self._run(self.heartbeat_script, room_id, str(user_id), time.time(), self.key_ttl)
+
+    def sweep(self, room_id):
+        """heartbeat 가 만료된 사용자를 정리하고 정리한 수를 반환합니다."""
+        return self._run(self.sweep_script, room_id)
+
+    def count(self, room_id):
+        key = self.key_format.format(room_id=room_id)
+        return self.client.zcount(key, self.get_cutoff(), '+inf')
+
+    def get_user_ids(self, room_id):
+        key = self.key_format.format(room_id=room_id)
+        return [user_id.decode() for user_id in self.client.zrangebyscore(key, self.get_cutoff(), '+inf')]
+
+    def get_member_counts(self, room_ids):
+        """
+        채팅방별 접속자 수를 HMGET 한 번으로 조회합니다. (마지막 입장/퇴장/sweep 시점 기준)
+        """
+        room_ids = [str(room_id) for room_id in room_ids]
+        if not room_ids:
+            return {}
+        counts = self.client.hmget(self.members_key, room_ids)
+        return {room_id: int(count) if count else 0 for room_id, count in zip(room_ids, counts)}
+
+    def get_all_member_counts(self):
+        """접속자가 있는 모든 채팅방의 접속자 수를 HGETALL 한 번으로 조회합니다."""
+        return {room_id.decode(): int(count) for room_id, count in self.client.hgetall(self.members_key).items()}
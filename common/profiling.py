@@ -0,0 +1,129 @@
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from redis import Redis
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """
+    요청 하나에서 사용한 SQL / 캐시 / serializer 시간을 모읍니다.
+
+    connection.execute_wrapper 로 등록하면 SQL 을, ProfiledRedis 를 통하면 Redis 명령을 집계합니다.
+    """
+
+    def __init__(self, slow_query_count=5):
+        self.slow_query_count = slow_query_count
+        self.started_at = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.cache_count = 0
+        self.cache_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+        self._slow_queries = []
+
+    @classmethod
+    def current(cls):
+        return _current_profile.get()
+
+    @contextmanager
+    def activate(self):
+        token = _current_profile.set(self)
+        try:
+            yield self
+        finally:
+            _current_profile.reset(token)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.sql_count += 1
+            self.sql_time += elapsed
+            item = (elapsed, self.sql_count, sql)
+            if len(self._slow_queries) < self.slow_query_count:
+                heapq.heappush(self._slow_queries, item)
+            else:
+                heapq.heappushpop(self._slow_queries, item)
+
+    def record_cache(self, elapsed):
+        self.cache_count += 1
+        self.cache_time += elapsed
+
+    @contextmanager
+    def measure_serializer(self):
+        # 중첩된 serializer 의 시간은 바깥 serializer 시간에 이미 포함되므로 한 번만 더합니다.
+        self._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._serializer_depth -= 1
+            if not self._serializer_depth:
+                self.serializer_time += time.perf_counter() - start
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started_at
+
+    def get_slow_queries(self):
+        return [(elapsed, sql) for elapsed, _, sql in sorted(self._slow_queries, reverse=True)]
+
+    def get_server_timing(self):
+        def metric(name, seconds, description):
+            return f'{name};dur={seconds * 1000:.2f};desc="{description}"'
+
+        return ', '.join([
+            metric('total', self.total_time, 'Total'),
+            metric('sql', self.sql_time, f'SQL ({self.sql_count})'),
+            metric('cache', self.cache_time, f'Cache ({self.cache_count})'),
+            metric('serializer', self.serializer_time, 'Serializer'),
+        ])
+
+
+def profile_serializer_data():
+    """
+    DRF serializer 의 data 조회를 감싸, 요청 프로파일이 있을 때 직렬화 시간을 기록합니다.
+
+    ServerTimingMiddleware 가 켜질 때 한 번 적용하며, data 를 조회하는 시점이나 결과는 바꾸지 않습니다.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    data = BaseSerializer.data
+    if getattr(data.fget, 'profiled', False):
+        return
+
+    def profiled_data(serializer):
+        profile = _current_profile.get()
+        if profile is None:
+            return data.fget(serializer)
+        with profile.measure_serializer():
+            return data.fget(serializer)
+
+    profiled_data.profiled = True
+    BaseSerializer.data = property(profiled_data)
+
+
+class ProfiledRedis(Redis):
+    """
+    요청 프로파일이 활성화되어 있을 때 Redis 명령 수와 시간을 기록합니다.
+
+    CACHES OPTIONS 의 REDIS_CLIENT_CLASS 로 지정하며, 프로파일이 없으면 ContextVar 조회 한 번만 추가됩니다.
+    """
+
+    def execute_command(self, *args, **options):
+        profile = _current_profile.get()
+        if profile is None:
+            return super().execute_command(*args, **options)
+
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            profile.record_cache(time.perf_counter() - start)
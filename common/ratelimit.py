@@ -0,0 +1,78 @@
+from django_redis import get_redis_connection
+
+from common.utils import get_redis_script
+
+
+class TokenBucket:
+    """
+    Redis hash 에 저장한 토큰 버킷으로 여러 워커에 걸쳐 요청 속도를 제한합니다.
+
+    한 번의 consume 으로 여러 버킷(예: 연결별 / 사용자별)을 Lua 스크립트 안에서 함께 확인하며,
+    모든 버킷에 토큰이 있을 때만 차감하므로 거부된 요청은 어느 버킷의 토큰도 쓰지 않습니다.
+    워커마다 시계가 다를 수 있으므로 충전량은 Redis 서버 시각(TIME)으로 계산합니다.
+    """
+    key_format = 'ratelimit:{scope}:{identifier}'
+
+    # KEYS: 버킷 hash 목록, ARGV[1]: 차감 토큰 수
+    # ARGV[2i], ARGV[2i + 1]: i 번째 버킷의 초당 충전량 / 최대 토큰 수
+    consume_script = """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local cost = tonumber(ARGV[1])
+    local tokens = {}
+    local retry_after = 0
+    for i, key in ipairs(KEYS) do
+        local rate = tonumber(ARGV[i * 2])
+        local burst = tonumber(ARGV[1 + i * 2])
+        local bucket = redis.call('HMGET', key, 'tokens', 'updated_at')
+        local available = tonumber(bucket[1]) or burst
+        local updated_at = tonumber(bucket[2]) or now
+        available = math.min(burst, available + math.max(0, now - updated_at) * rate)
+        tokens[i] = available
+        if available < cost then
+            retry_after = math.max(retry_after, (cost - available) / rate)
+        end
+    end
+    if retry_after > 0 then
+        return {0, tostring(retry_after)}
+    end
+    for i, key in ipairs(KEYS) do
+        local rate = tonumber(ARGV[i * 2])
+        local burst = tonumber(ARGV[1 + i * 2])
+        redis.call('HSET', key, 'tokens', tostring(tokens[i] - cost), 'updated_at', tostring(now))
+        redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+    end
+    return {1, '0'}
+    """
+
+    def __init__(self, scope, rate, burst, alias='default'):
+        self.scope = scope
+        self.rate = rate
+        self.burst = burst
+        self.alias = alias
+
+    @property
+    def client(self):
+        return get_redis_connection(self.alias)
+
+    def get_key(self, identifier):
+        return self.key_format.format(scope=self.scope, identifier=identifier)
+
+    def consume(self, identifier, cost=1):
+        """
+        토큰을 차감했으면 (True, 0), 부족하면 (False, 다시 시도할 수 있을 때까지의 초) 를 반환합니다.
+        """
+        return consume_all([(self, identifier)], cost)
+
+
+def consume_all(buckets, cost=1):
+    """
+    (TokenBucket, identifier) 목록의 모든 버킷에서 원자적으로 토큰을 차감합니다.
+    """
+    consume = get_redis_script(buckets[0][0].alias, TokenBucket.consume_script)
+    keys = [bucket.get_key(identifier) for bucket, identifier in buckets]
+    args = [cost]
+    for bucket, _ in buckets:
+        args.extend([bucket.rate, bucket.burst])
+    allowed, retry_after = consume(keys=keys, args=args)
+    return bool(allowed), float(retry_after)
@@ -0,0 +1,18 @@
+from rest_framework.renderers import JSONRenderer
+
+from common.codecs import JsonCodec, OrjsonCodec
+
+
+class CodecJSONRenderer(JSONRenderer):
+    """
+    JSON_CODEC 설정이 orjson 이면 orjson 으로 응답을 인코딩합니다.
+
+    들여쓰기를 요청한 경우(브라우저 등)에는 기본 JSONRenderer 로 처리합니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if JsonCodec is not OrjsonCodec or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return OrjsonCodec.encode_bytes(data)
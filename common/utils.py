@@ -1,6 +1,9 @@
 import logging
+from functools import lru_cache
+
 from django.core.cache import cache
 from django.conf import settings
+from django_redis import get_redis_connection
 
 from common.exceptions import ExpiredApiCacheData
 
@@ -33,3 +36,12 @@ class CacheDataManager:
         cache_key = CacheDataManager._get_cache_key(data_type, unique_key)
         cache.delete(cache_key)
 
+
+@lru_cache(maxsize=None)
+def get_redis_script(alias, source):
+    """
+    Lua 스크립트를 alias 의 Redis client 에 한 번만 등록하고 Script 객체를 재사용합니다.
+
+    호출할 때마다 register_script 로 Script 를 만들고 SHA1 을 다시 계산하지 않도록 (alias, 스크립트) 별로 보관합니다.
+    """
+    return get_redis_connection(alias).register_script(source)
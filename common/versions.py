@@ -0,0 +1,51 @@
+import hashlib
+import uuid
+
+from django.db import transaction
+from django_redis import get_redis_connection
+
+
+class ResourceVersions:
+    """
+    리소스별 버전 카운터를 Redis hash 하나에 보관합니다.
+
+    리소스가 바뀔 때 bump 로 카운터를 올리고, 조회 응답은 카운터 값으로 만든 ETag 를 내려줍니다.
+    Redis 가 초기화되어 카운터가 다시 0 부터 시작해도 이전 ETag 와 겹치지 않도록 epoch 를 함께 사용합니다.
+    """
+    key = 'resource:versions'
+    epoch_field = '__epoch__'
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def client(self):
+        return get_redis_connection(self.alias)
+
+    def get(self, names):
+        """epoch 와 리소스별 버전을 HMGET 한 번으로 조회합니다."""
+        epoch, *versions = self.client.hmget(self.key, [self.epoch_field, *names])
+        if epoch is None:
+            self.client.hsetnx(self.key, self.epoch_field, uuid.uuid4().hex)
+            epoch = self.client.hget(self.key, self.epoch_field)
+        return epoch.decode(), [int(version or 0) for version in versions]
+
+    def bump(self, *names):
+        pipeline = self.client.pipeline(transaction=False)
+        for name in names:
+            pipeline.hincrby(self.key, name, 1)
+        pipeline.execute()
+
+    def bump_on_commit(self, *names):
+        """
+        트랜잭션이 커밋된 뒤에 버전을 올립니다. 커밋 전에 올리면 이전 데이터가 새 ETag 로 응답될 수 있습니다.
+        """
+        transaction.on_commit(lambda: self.bump(*names), robust=True)
+
+    def get_etag(self, names, *variants):
+        """
+        리소스 버전과 variants(응답 형식, 쿼리 문자열 등)로 strong ETag 를 만듭니다.
+        """
+        epoch, versions = self.get(names)
+        parts = [epoch, *(f'{name}={version}' for name, version in zip(names, versions)), *map(str, variants)]
+        return '"{}"'.format(hashlib.sha1('|'.join(parts).encode()).hexdigest())
@@ -1,10 +1,22 @@
 from django.http.request import QueryDict
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework.response import Response
 
+from common.versions import ResourceVersions
+
+
+class NotModified(Exception):
+    pass
+
 
 class MappingViewSetMixin(object):
     serializer_action_map = {}
     permission_classes_map = {}
+    # 조건부 GET: action 별로 ETag 를 만들 버전 리소스 이름 (self.kwargs 로 format 합니다.)
+    # 예) {'retrieve': ['chat:room:{pk}']}
+    etag_action_map = {}
+    etag = None
 
     def get_permissions(self):
         permission_classes = self.permission_classes
@@ -18,6 +30,45 @@ class MappingViewSetMixin(object):
             return self.serializer_action_map[self.action]
         return self.serializer_class
 
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.get_etag(request)
+        if self.etag and self.etag in self.get_if_none_match(request):
+            # 버전이 같으면 DB 조회와 직렬화 없이 304 로 응답합니다.
+            raise NotModified
+
+    def get_etag(self, request):
+        names = self.etag_action_map.get(self.action)
+        if not names or request.method not in ('GET', 'HEAD'):
+            return None
+        names = [name.format(**self.kwargs) for name in names]
+        return ResourceVersions().get_etag(
+            names, request.accepted_media_type, request.META.get('QUERY_STRING', ''), *self.get_etag_variants(request)
+        )
+
+    def get_etag_variants(self, request):
+        """버전 카운터로 추적되지 않는 값이 응답에 포함되면, 그 값을 반환해 ETag 에 함께 반영합니다."""
+        return []
+
+    @staticmethod
+    def get_if_none_match(request):
+        # If-None-Match 는 weak 비교이므로 W/ 접두어를 떼고 비교합니다.
+        etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        return [etag[2:] if etag.startswith('W/') else etag for etag in etags]
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self.etag
+            # 브라우저가 캐시된 응답을 쓰기 전에 항상 ETag 로 재검증하도록 합니다.
+            response['Cache-Control'] = 'no-cache'
+        return response
+
 
 class RetrieveModelMixin(object):
     def retrieve(self, request, *args, **kwargs):
@@ -0,0 +1,121 @@
+import asyncio
+import atexit
+import logging
+import threading
+
+from channels.db import database_sync_to_async
+
+from common.designpatterns import SingletonClass
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer(SingletonClass):
+    """
+    항목을 메모리에 모았다가 한 번에 저장하는 write-behind 버퍼의 기반 클래스입니다.
+
+    batch_size 만큼 쌓이거나 flush_interval 초가 지나면 save 로 저장하고, 저장에 실패한 항목은
+    다시 버퍼 앞쪽에 넣습니다. (max_pending 을 넘으면 가장 오래된 항목부터 버립니다.)
+    서브클래스는 save 를 구현하며, 버퍼가 list 가 아니면 new_buffer / put / merge / drop_oldest 도 구현합니다.
+    """
+    name = 'Write-behind'
+
+    def __init__(self, flush_interval, batch_size=None, max_pending=None):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.flushed_count = 0
+        self.dropped_count = 0
+        self._buffer = self.new_buffer()
+        self._lock = threading.Lock()
+        self._timer_task = None
+        self._flush_tasks = set()
+
+    @classmethod
+    def flush_on_exit(cls):
+        """워커 종료 시 아직 저장되지 않은 항목을 flush 합니다. (AppConfig.ready 에서 호출)"""
+        atexit.register(lambda: cls.instance().flush_sync())
+
+    @property
+    def pending_count(self):
+        return len(self._buffer)
+
+    def get_stats(self):
+        return {
+            'pending': self.pending_count,
+            'flushed': self.flushed_count,
+            'dropped': self.dropped_count,
+        }
+
+    def new_buffer(self):
+        return []
+
+    def put(self, buffer, item):
+        buffer.append(item)
+
+    def merge(self, failed, buffer):
+        return failed + buffer
+
+    def drop_oldest(self, buffer, count):
+        del buffer[:count]
+
+    def save(self, batch):
+        """모은 항목을 저장하고 저장한 수를 반환합니다. 실패하면 예외를 발생시킵니다."""
+        raise NotImplementedError
+
+    def add(self, item):
+        with self._lock:
+            self.put(self._buffer, item)
+            is_full = self.batch_size is not None and len(self._buffer) >= self.batch_size
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if is_full:
+                self.flush_sync()
+            return
+
+        self._ensure_timer(loop)
+        if is_full:
+            task = loop.create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self):
+        return await database_sync_to_async(self.flush_sync)()
+
+    def flush_sync(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, self.new_buffer()
+        if not batch:
+            return 0
+
+        try:
+            saved = self.save(batch)
+        except Exception as e:
+            logger.error(f'{self.name} flush error: {str(e)}')
+            self._requeue(batch)
+            return 0
+
+        self.flushed_count += saved
+        return saved
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._buffer = self.merge(batch, self._buffer)
+            overflow = len(self._buffer) - self.max_pending if self.max_pending else 0
+            if overflow > 0:
+                self.drop_oldest(self._buffer, overflow)
+                self.dropped_count += overflow
+                logger.error(f'{self.name} buffer overflow: dropped {overflow} items')
+
+    def _ensure_timer(self, loop):
+        if self._timer_task and not self._timer_task.done() and self._timer_task.get_loop() is loop:
+            return
+        self._timer_task = loop.create_task(self._run_timer())
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                await self.flush()
@@ -41,7 +41,7 @@ function ChatListPage() {
           'Content-Type': 'application/json'
         }
       });
-      setActiveUsers(response.data);
+      setActiveUsers(response.data.results);
     } catch (err) {
       setError('Failed to fetch active users. Please try again.');
       console.error(err);
@@ -115,7 +115,10 @@ function ChatListPage() {
             <li key={chat.id} style={styles.chatItem}>
               <Link to={`/chat/${chat.id}`} style={styles.chatLink}>
                 <h3 style={styles.chatTitle}>{chat.title}</h3>
-                <p style={styles.chatMeta}>Created at: {new Date(chat.created_at).toLocaleString()}</p>
+                {chat.last_message_preview && <p style={styles.chatMeta}>{chat.last_message_preview}</p>}
+                <p style={styles.chatMeta}>
+                  {chat.member_count} online · {chat.message_count} messages · Last active: {new Date(chat.last_message_at).toLocaleString()}
+                </p>
               </Link>
               <button 
                 onClick={() => deleteChat(chat.id)} 
@@ -110,6 +110,13 @@ function ChatRoomPage() {
         setMessages(prevMessages => [...prevMessages, { type: 'system', content: data.message, id: Date.now() }]);
         fetchActiveUsers();
         break;
+      case 'presence_delta':
+        setConnectedUsers(data.connected_users_count);
+        fetchActiveUsers();
+        break;
+      case 'rate_limited':
+        setMessages(prevMessages => [...prevMessages, { type: 'system', content: data.error, id: Date.now() }]);
+        break;
       default:
         if (data.message) {
           setMessages(prevMessages => [...prevMessages, {